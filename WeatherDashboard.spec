@@ -1,12 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+
+datas = [('weather-api.py', '.')]
+if os.path.exists('cities.gaz'):
+    datas.append(('cities.gaz', '.'))
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('weather-api.py', '.')],
-    hiddenimports=['gi', 'gi.overrides.Gtk', 'gi.repository.Gtk', 'gi.repository.Gio', 'gi.repository.GLib'],
+    datas=datas,
+    # weather-api.py ships as data and is loaded by path, so PyInstaller cannot see its
+    # imports: list the local and standard-library modules only it uses.
+    hiddenimports=['gi', 'gi.overrides.Gtk', 'gi.repository.Gtk', 'gi.repository.Gdk', 'gi.repository.Gio', 'gi.repository.GLib', 'autocomplete', 'gazetteer', 'geocache', 'units', 'asyncio', 'contextvars', 'http.client', 'ssl', 'zlib'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
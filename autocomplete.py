@@ -0,0 +1,131 @@
+import bisect
+import heapq
+import threading
+
+from gazetteer import Gazetteer
+
+SUGGESTION_LIMIT = 8
+# Remote suggestions wait for a pause in typing and a prefix long enough to be specific.
+REMOTE_DELAY_MS = 300
+REMOTE_MIN_CHARS = 3
+RECENT_LIMIT = 5000
+
+
+def _suggest_key(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def location_label(location: dict) -> str:
+    # "Paris, France": both the gazetteer and geocoded suggestions resolve this form back
+    # to the same place (the gazetteer by country qualifier, the others through the
+    # geocode cache entry WeatherClient.search_cities leaves behind).
+    name = location.get("name", "")
+    country = location.get("country") or location.get("country_code") or ""
+    return f"{name}, {country}" if country else name
+
+
+class CityIndex:
+    # As-you-type city suggestions. Favorites and names looked up before live in a sorted
+    # array of normalized keys, so a prefix is a bisect plus a scan of its own range;
+    # the bundled gazetteer is searched in place by Gazetteer.complete. Favorites rank
+    # first, then recent lookups (most recent first), then gazetteer places by population.
+    # Readers never lock: every update swaps in a new array.
+    def __init__(self, gazetteer: Gazetteer | None = None, limit: int = SUGGESTION_LIMIT):
+        self.gazetteer = gazetteer
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._favorites: list[str] = []
+        self._recent: list[tuple[str, str]] = []
+        self._keys: list[str] = []
+        self._entries: list[tuple[int, str]] = []
+
+    def _rebuild(self) -> None:
+        rows = []
+        seen = set()
+        for rank, city in enumerate(self._favorites):
+            key = _suggest_key(city)
+            if key and key not in seen:
+                seen.add(key)
+                rows.append((key, rank, city))
+        offset = len(self._favorites)
+        for rank, (query, name) in enumerate(self._recent, start=offset):
+            for key in {_suggest_key(query), _suggest_key(name)} - {""}:
+                if key not in seen:
+                    seen.add(key)
+                    rows.append((key, rank, name))
+        rows.sort()
+        self._keys, self._entries = [row[0] for row in rows], [(row[1], row[2]) for row in rows]
+
+    def load(
+        self,
+        favorites: list[str] | None = None,
+        recent: list[tuple[str, str]] | None = None,
+        gazetteer: Gazetteer | None = None,
+    ) -> None:
+        # recent is (query, name) pairs, most recent first, as GeocodeCache.recent gives them.
+        with self._lock:
+            if favorites is not None:
+                self._favorites = list(favorites)
+            if recent is not None:
+                self._recent = list(recent[:RECENT_LIMIT])
+            if gazetteer is not None:
+                self.gazetteer = gazetteer
+            self._rebuild()
+
+    def set_favorites(self, favorites: list[str]) -> None:
+        self.load(favorites=favorites)
+
+    def add_recent(self, name: str) -> None:
+        key = _suggest_key(name)
+        if not key:
+            return
+        with self._lock:
+            recent = [(query, known) for query, known in self._recent if _suggest_key(known) != key]
+            self._recent = [(name, name)] + recent[: RECENT_LIMIT - 1]
+            self._rebuild()
+
+    def _local(self, key: str, limit: int) -> list[str]:
+        keys, entries = self._keys, self._entries
+        lo = bisect.bisect_left(keys, key)
+        hi = bisect.bisect_right(keys, key + "\U0010ffff", lo)
+        best = heapq.nsmallest(limit * 2, entries[lo:hi])
+        results = []
+        for _, text in best:
+            if text not in results:
+                results.append(text)
+        return results[:limit]
+
+    def suggest(self, text: str, limit: int | None = None) -> list[str]:
+        limit = self.limit if limit is None else limit
+        key = _suggest_key(text)
+        if not key:
+            return []
+        results = self._local(key, limit)
+        if len(results) < limit and self.gazetteer is not None:
+            # A bare name already offered stands for the gazetteer's most populous place
+            # of that name, so that one is not listed again with its country.
+            names = {_suggest_key(result) for result in results}
+            for location in self.gazetteer.complete(key, limit):
+                name = _suggest_key(location["name"])
+                if name in names:
+                    names.discard(name)
+                    continue
+                label = location_label(location)
+                if label not in results:
+                    results.append(label)
+                if len(results) == limit:
+                    break
+        return results
+
+
+def merge_suggestions(local: list[str], remote: list[str], limit: int = SUGGESTION_LIMIT) -> list[str]:
+    seen = {_suggest_key(text) for text in local}
+    merged = list(local)
+    for text in remote:
+        if len(merged) >= limit:
+            break
+        key = _suggest_key(text)
+        if key not in seen:
+            seen.add(key)
+            merged.append(text)
+    return merged
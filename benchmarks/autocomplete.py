@@ -0,0 +1,54 @@
+# Times CityIndex.suggest against a synthetic gazetteer the size of GeoNames cities500.
+# Run from the repo root: python benchmarks/autocomplete.py [--places N] [--repeat N]
+
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from autocomplete import CityIndex  # noqa: E402
+from gazetteer import Gazetteer, build_gazetteer  # noqa: E402
+
+
+def _rows(rng: random.Random, places: int):
+    for _ in range(places):
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12))).title()
+        yield (name, name, "XX", "Nowhere", rng.uniform(-80, 80), rng.uniform(-180, 180), rng.randint(500, 10**7))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark as-you-type city suggestions.")
+    parser.add_argument("--places", type=int, default=200_000, help="places in the synthetic gazetteer")
+    parser.add_argument("--repeat", type=int, default=200, help="suggestions per prefix")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "cities.gaz"
+        entries = build_gazetteer(_rows(rng, args.places), path)
+        gazetteer = Gazetteer(path)
+        started = time.perf_counter()
+        gazetteer.warm()
+        print(f"{entries} entries, short-prefix table built in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        recent = [(f"recent{i}", f"Recent{i}") for i in range(5000)]
+        index = CityIndex(gazetteer)
+        index.load(favorites=["Paris", "Portland", "Perth"], recent=recent)
+        worst = 0.0
+        for prefix in ("p", "pa", "par", "pari", "re", "recent1", "q", "zz", "abcdef"):
+            best = min(timeit.repeat(lambda: index.suggest(prefix), number=args.repeat, repeat=3)) / args.repeat
+            worst = max(worst, best)
+            print(f"{prefix!r:<12}{best * 1000:>8.3f}ms")
+        print(f"worst {worst * 1000:.3f}ms")
+        gazetteer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Compares the JSON backends weather-api.py can pick on realistic payload sizes.
+# Run from the repo root: python benchmarks/json_decode.py [--repeat N]
+
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_weather_module():
+    sys.path.insert(0, str(ROOT))
+    spec = importlib.util.spec_from_file_location("weather_api_bench", ROOT / "weather-api.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _hourly_block(rng: random.Random, hours: int) -> dict:
+    return {
+        "time": [1792195200 + 3600 * h for h in range(hours)],
+        "temperature_2m": [round(rng.uniform(-10, 35), 1) for _ in range(hours)],
+        "precipitation_probability": [rng.randint(0, 100) for _ in range(hours)],
+        "wind_speed_10m": [round(rng.uniform(0, 60), 1) for _ in range(hours)],
+        "weather_code": [rng.choice((0, 1, 2, 3, 45, 61, 80, 95)) for _ in range(hours)],
+    }
+
+
+def _location(rng: random.Random, hours: int = 0) -> dict:
+    payload = {
+        "latitude": round(rng.uniform(-60, 60), 4),
+        "longitude": round(rng.uniform(-180, 180), 4),
+        "utc_offset_seconds": 3600,
+        "timezone": "Europe/Berlin",
+        "current": {
+            "time": "2026-10-17T12:00",
+            "temperature_2m": round(rng.uniform(-10, 35), 1),
+            "relative_humidity_2m": rng.randint(10, 100),
+            "apparent_temperature": round(rng.uniform(-15, 38), 1),
+            "wind_speed_10m": round(rng.uniform(0, 60), 1),
+            "weather_code": 3,
+        },
+        "daily": {
+            "time": [f"2026-10-{17 + d}" for d in range(5)],
+            "temperature_2m_max": [round(rng.uniform(10, 35), 1) for _ in range(5)],
+            "temperature_2m_min": [round(rng.uniform(-10, 10), 1) for _ in range(5)],
+            "weather_code": [rng.choice((0, 3, 61)) for _ in range(5)],
+        },
+    }
+    if hours:
+        payload["hourly"] = _hourly_block(rng, hours)
+    return payload
+
+
+def payloads() -> dict[str, bytes]:
+    rng = random.Random(42)
+    return {
+        "batch 100 locations": json.dumps([_location(rng) for _ in range(100)]).encode(),
+        "hourly 16 days": json.dumps(_location(rng, hours=16 * 24)).encode(),
+        "batch 20 x hourly 16 days": json.dumps([_location(rng, hours=16 * 24) for _ in range(20)]).encode(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoding backends.")
+    parser.add_argument("--repeat", type=int, default=50, help="decodes per payload and backend")
+    args = parser.parse_args()
+
+    weather_api = _load_weather_module()
+    backends = {}
+    for name in ("json", "ujson", "orjson"):
+        selected, loads = weather_api._select_json_decoder(name)
+        if selected == name:
+            backends[name] = loads
+
+    print(f"default backend: {weather_api.JSON_BACKEND}")
+    print(f"{'payload':<28}{'size':>10}  " + "".join(f"{name:>12}" for name in backends))
+    for label, raw in payloads().items():
+        row = f"{label:<28}{len(raw) / 1024:>8.0f}KB  "
+        for loads in backends.values():
+            best = min(timeit.repeat(lambda: loads(raw), number=args.repeat, repeat=3)) / args.repeat
+            row += f"{best * 1000:>10.2f}ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
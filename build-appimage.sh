@@ -47,6 +47,13 @@ fi
 cd "$SCRIPT_DIR"
 rm -rf "$APPDIR" "$DIST_DIR" "$BUILD_DIR" "${APP_NAME}.spec" "${APP_ID}.spec"
 
+GAZETTEER_DATA=()
+if [ -f cities.gaz ]; then
+  GAZETTEER_DATA=(--add-data "cities.gaz:.")
+else
+  echo "cities.gaz not found; run ./build-gazetteer.sh to bundle the offline gazetteer."
+fi
+
 python3 -m PyInstaller \
   --noconfirm \
   --clean \
@@ -56,9 +63,20 @@ python3 -m PyInstaller \
   --hidden-import=gi \
   --hidden-import=gi.overrides.Gtk \
   --hidden-import=gi.repository.Gtk \
+  --hidden-import=gi.repository.Gdk \
   --hidden-import=gi.repository.Gio \
   --hidden-import=gi.repository.GLib \
+  --hidden-import=geocache \
+  --hidden-import=units \
+  --hidden-import=gazetteer \
+  --hidden-import=autocomplete \
+  --hidden-import=asyncio \
+  --hidden-import=contextvars \
+  --hidden-import=http.client \
+  --hidden-import=ssl \
+  --hidden-import=zlib \
   --add-data "weather-api.py:." \
+  ${GAZETTEER_DATA[@]+"${GAZETTEER_DATA[@]}"} \
   "$ENTRY"
 
 mkdir -p "$APPDIR/usr/bin"
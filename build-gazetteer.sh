@@ -0,0 +1,19 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Builds cities.gaz, the offline gazetteer bundled by the AppImage, Flatpak and
+# PyInstaller builds, from the GeoNames dump (CC BY 4.0). GEONAMES_DATASET can pick
+# cities500, cities1000, cities5000 or cities15000 (the default).
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+DATASET="${GEONAMES_DATASET:-cities15000}"
+BASE_URL="https://download.geonames.org/export/dump"
+WORK_DIR="$SCRIPT_DIR/.gazetteer-src"
+
+mkdir -p "$WORK_DIR"
+curl -fL -o "$WORK_DIR/$DATASET.zip" "$BASE_URL/$DATASET.zip"
+curl -fL -o "$WORK_DIR/countryInfo.txt" "$BASE_URL/countryInfo.txt"
+python3 -m zipfile -e "$WORK_DIR/$DATASET.zip" "$WORK_DIR"
+
+python3 "$SCRIPT_DIR/gazetteer.py" "$WORK_DIR/$DATASET.txt" \
+  --countries "$WORK_DIR/countryInfo.txt" \
+  -o "$SCRIPT_DIR/cities.gaz"
@@ -0,0 +1,146 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from settings import SETTINGS_PATH
+
+GEOCODE_CACHE_PATH = SETTINGS_PATH.with_name("geocode-cache.sqlite3")
+
+# Returned by GeocodeCache.get for cities the geocoder already reported as unknown.
+NOT_FOUND = object()
+
+
+def normalize_city(city: str) -> str:
+    return " ".join(city.casefold().split())
+
+
+class GeocodeCache:
+    def __init__(
+        self,
+        path: Path | str = GEOCODE_CACHE_PATH,
+        ttl: float = 180 * 24 * 3600,
+        negative_ttl: float = 24 * 3600,
+        max_entries: int = 5000,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._disabled = False
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is not None or self._disabled:
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " query TEXT NOT NULL,"
+                " language TEXT NOT NULL,"
+                " name TEXT,"
+                " country TEXT,"
+                " latitude REAL,"
+                " longitude REAL,"
+                " fetched_at REAL NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (query, language))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS geocode_last_used ON geocode (last_used)")
+        except (OSError, sqlite3.Error):
+            # A broken or read-only config dir should only cost us the cache, not geocoding.
+            self._disabled = True
+            return None
+        self._conn = conn
+        return conn
+
+    def get(self, city: str, language: str = "en"):
+        key = normalize_city(city)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT name, country, latitude, longitude, fetched_at FROM geocode"
+                    " WHERE query = ? AND language = ?",
+                    (key, language),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                name, country, latitude, longitude, fetched_at = row
+                ttl = self.ttl if latitude is not None else self.negative_ttl
+                if now - fetched_at > ttl:
+                    conn.execute("DELETE FROM geocode WHERE query = ? AND language = ?", (key, language))
+                    return None
+
+                conn.execute(
+                    "UPDATE geocode SET last_used = ? WHERE query = ? AND language = ?",
+                    (now, key, language),
+                )
+            except sqlite3.Error:
+                return None
+
+        if latitude is None:
+            return NOT_FOUND
+        return {"name": name, "country": country or "", "latitude": latitude, "longitude": longitude}
+
+    def put(self, city: str, location: dict | None, language: str = "en") -> None:
+        key = normalize_city(city)
+        now = time.time()
+        if location is None:
+            values = (key, language, None, None, None, None, now, now)
+        else:
+            values = (
+                key,
+                language,
+                location.get("name"),
+                location.get("country", ""),
+                location.get("latitude"),
+                location.get("longitude"),
+                now,
+                now,
+            )
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+                (count,) = conn.execute("SELECT COUNT(*) FROM geocode").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM geocode WHERE rowid IN"
+                        " (SELECT rowid FROM geocode ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+            except sqlite3.Error:
+                pass
+
+    def recent(self, limit: int = 5000, language: str = "en") -> list[tuple[str, str]]:
+        # (query, resolved name) for places found before, most recently used first.
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            try:
+                return conn.execute(
+                    "SELECT query, name FROM geocode WHERE language = ? AND latitude IS NOT NULL"
+                    " ORDER BY last_used DESC LIMIT ?",
+                    (language, limit),
+                ).fetchall()
+            except sqlite3.Error:
+                return []
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,8 +1,20 @@
-from ui import WeatherApp
+import time
 
+_STARTED = time.perf_counter()
 
-def main():
-    app = WeatherApp()
+import sys
+
+from startup import StartupProfile, profile_requested
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    profile = StartupProfile(_STARTED, enabled=profile_requested(argv))
+    # Gtk and the UI load here rather than at module level so the profile covers them.
+    from ui import WeatherApp
+
+    profile.mark("imports")
+    app = WeatherApp(profile=profile)
     app.run(None)
 
 
@@ -1,6 +1,11 @@
+import copy
 import json
 import os
+import tempfile
+import threading
+import time
 from pathlib import Path
+from typing import Callable
 
 APP_ID = "org.evans.Weather"
 LOCAL_SETTINGS_PATH = Path(__file__).with_name("settings.json")
@@ -17,12 +22,14 @@ def _get_settings_path() -> Path:
 
 
 SETTINGS_PATH = _get_settings_path()
+SAVE_DELAY_SECONDS = 0.5
 
 DEFAULT_SETTINGS = {
     "city": "New York",
     "units": "imperial",  # imperial (F/mph) or metric (C/m/s)
     "theme": "dark",
     "favorites": ["New York", "Los Angeles", "Chicago"],
+    "prefetch_interval": 600,  # seconds between background refreshes of saved cities
 }
 
 
@@ -42,7 +49,242 @@ def load_settings() -> dict:
     return merged
 
 
+def _serialize(settings: dict) -> bytes:
+    return json.dumps(settings, indent=2).encode("utf-8")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # Write a sibling temp file, fsync it, then rename over the target, so a crash leaves
+    # either the old file or the new one and never a torn mix.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    if os.name != "nt":
+        # Persist the rename itself; Windows cannot open a directory for fsync.
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
 def save_settings(settings: dict) -> None:
-    SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with SETTINGS_PATH.open("w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
+    _atomic_write(SETTINGS_PATH, _serialize(settings))
+
+
+class SettingsWriter:
+    # Saves settings on a background thread. save() serializes the dict right away (so
+    # later edits by the caller cannot race the write) and restarts a short debounce, so
+    # a burst of changes becomes a single write. Content identical to what is already on
+    # disk is not rewritten. close() writes anything still pending before returning.
+    def __init__(self, path: Path | str | None = None, delay: float = SAVE_DELAY_SECONDS):
+        self.path = SETTINGS_PATH if path is None else Path(path)
+        self.delay = delay
+        self.stats = {"requested": 0, "written": 0, "unchanged": 0, "failed": 0}
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending: bytes | None = None
+        self._due = 0.0
+        self._last_written: bytes | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._pending is not None
+
+    @property
+    def last_written(self) -> bytes | None:
+        return self._last_written
+
+    def save(self, settings: dict) -> None:
+        data = _serialize(settings)
+        with self._cond:
+            self.stats["requested"] += 1
+            self._pending = data
+            self._due = time.monotonic() + self.delay
+            if not self._closed:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+                return
+        # Saves that arrive after close() are written right away.
+        self._write_pending()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is None:
+                        if self._closed:
+                            return
+                        self._cond.wait()
+                        continue
+                    remaining = self._due - time.monotonic()
+                    if remaining <= 0 or self._closed:
+                        break
+                    self._cond.wait(remaining)
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        # Taking the pending bytes under the write lock keeps writes in save() order.
+        with self._write_lock:
+            with self._cond:
+                data, self._pending = self._pending, None
+            if data is None:
+                return
+            # Compare with the file itself, not our last write: another instance may
+            # have changed it since.
+            try:
+                current = self.path.read_bytes()
+            except OSError:
+                current = None
+            if data == current:
+                self._last_written = data
+                self.stats["unchanged"] += 1
+                return
+            try:
+                _atomic_write(self.path, data)
+            except OSError:
+                self.stats["failed"] += 1
+                return
+            self._last_written = data
+            self.stats["written"] += 1
+
+    def flush(self) -> None:
+        self._write_pending()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self._write_pending()
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse_settings(raw: bytes) -> dict | None:
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    merged = copy.deepcopy(DEFAULT_SETTINGS)
+    merged.update(data)
+    return merged
+
+
+class SettingsStore:
+    # Parsed settings kept in memory and saved through a SettingsWriter. reload() only
+    # re-reads the file when its mtime or size moved, and ignores our own writes. Every
+    # changed key is reported to subscribers, for local set() calls and edits made by
+    # another instance alike. Values are copied in and out, so callers cannot change the
+    # store by mutating a list they got from it. The UIs call reload() from a file
+    # monitor; this module stays toolkit-free.
+    def __init__(self, path: Path | str | None = None, writer: SettingsWriter | None = None):
+        self.path = SETTINGS_PATH if path is None else Path(path)
+        self.writer = writer if writer is not None else SettingsWriter(self.path)
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, tuple[frozenset[str] | None, Callable[[str, object], None]]] = {}
+        self._next_handle = 0
+        self._stat = _stat_key(self.path)
+
+        source = self.path
+        if self._stat is None and self.path == SETTINGS_PATH:
+            source = LOCAL_SETTINGS_PATH
+        try:
+            data = _parse_settings(source.read_bytes())
+        except OSError:
+            data = None
+        self._data = data if data is not None else copy.deepcopy(DEFAULT_SETTINGS)
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            return copy.deepcopy(self._data.get(key, default))
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def set(self, key: str, value) -> None:
+        self.update({key: value})
+
+    def update(self, values: dict) -> None:
+        with self._lock:
+            changed = {key: copy.deepcopy(value) for key, value in values.items() if self._data.get(key) != value}
+            if not changed:
+                return
+            self._data.update(changed)
+            self.writer.save(self._data)
+        self._notify(changed)
+
+    def subscribe(self, callback: Callable[[str, object], None], *keys: str) -> int:
+        # No keys means every key.
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._subscribers[handle] = (frozenset(keys) or None, callback)
+        return handle
+
+    def unsubscribe(self, handle: int) -> None:
+        with self._lock:
+            self._subscribers.pop(handle, None)
+
+    def reload(self) -> bool:
+        stat = _stat_key(self.path)
+        with self._lock:
+            if stat is None or stat == self._stat:
+                return False
+            if self.writer.pending:
+                # Our newer values are about to replace the file anyway.
+                return False
+            try:
+                raw = self.path.read_bytes()
+            except OSError:
+                return False
+            self._stat = stat
+            if raw == self.writer.last_written:
+                return False
+            data = _parse_settings(raw)
+            if data is None:
+                # Most likely a half-written file from a writer without atomic saves.
+                self._stat = None
+                return False
+            changed = {key: value for key, value in data.items() if self._data.get(key) != value}
+            self._data = data
+        self._notify(changed)
+        return bool(changed)
+
+    def _notify(self, changed: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for key, value in changed.items():
+            for keys, callback in subscribers:
+                if keys is None or key in keys:
+                    callback(key, copy.deepcopy(value))
+
+    def close(self) -> None:
+        self.writer.close()
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from settings import SETTINGS_PATH
+
+SNAPSHOT_PATH = SETTINGS_PATH.with_name("weather-snapshots.sqlite3")
+
+
+def _snapshot_key(city: str) -> str:
+    return " ".join(city.casefold().split())
+
+
+def format_as_of(fetched_at: float) -> str:
+    stamp = time.localtime(fetched_at)
+    if time.strftime("%Y-%m-%d", stamp) == time.strftime("%Y-%m-%d"):
+        return "as of " + time.strftime("%H:%M", stamp)
+    return "as of " + time.strftime("%b %d %H:%M", stamp)
+
+
+def stale_as_of(bundle: dict, max_age: float) -> float | None:
+    # The bundle's fetch time when it is older than max_age (a stale cache entry served
+    # while revalidating, or a prefetched bundle), so the UI can badge it; else None.
+    fetched_at = bundle.get("fetched_at")
+    if fetched_at is None or time.time() - fetched_at <= max_age:
+        return None
+    return fetched_at
+
+
+class SnapshotStore:
+    # Last good bundle ({"current": ..., "forecast": [...]}) per city and units, kept on
+    # disk so the UI can paint before the first fetch and keep showing something when
+    # every provider is unreachable.
+    def __init__(self, path: Path | str = SNAPSHOT_PATH, max_entries: int = 200):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._disabled = False
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is not None or self._disabled:
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshot ("
+                " city TEXT NOT NULL,"
+                " units TEXT NOT NULL,"
+                " bundle TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (city, units))"
+            )
+        except (OSError, sqlite3.Error):
+            self._disabled = True
+            return None
+        self._conn = conn
+        return conn
+
+    def get(self, city: str, units: str) -> tuple[float, dict] | None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT bundle, fetched_at FROM snapshot WHERE city = ? AND units = ?",
+                    (_snapshot_key(city), units),
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+        if row is None:
+            return None
+
+        try:
+            bundle = json.loads(row[0])
+        except ValueError:
+            return None
+        return row[1], bundle
+
+    def put(self, city: str, units: str, bundle: dict, fetched_at: float | None = None) -> None:
+        payload = json.dumps({"current": bundle["current"], "forecast": bundle["forecast"]})
+        if fetched_at is None:
+            fetched_at = bundle.get("fetched_at") or time.time()
+        values = (_snapshot_key(city), units, payload, fetched_at)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("INSERT OR REPLACE INTO snapshot VALUES (?, ?, ?, ?)", values)
+                (count,) = conn.execute("SELECT COUNT(*) FROM snapshot").fetchone()
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM snapshot WHERE rowid IN"
+                        " (SELECT rowid FROM snapshot ORDER BY fetched_at LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+            except sqlite3.Error:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
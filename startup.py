@@ -0,0 +1,51 @@
+import os
+import sys
+import threading
+import time
+
+PROFILE_FLAG = "--profile-startup"
+
+
+def profile_requested(argv: list[str]) -> bool:
+    if PROFILE_FLAG in argv:
+        return True
+    return os.getenv("WEATHER_PROFILE_STARTUP", "").strip().lower() in {"1", "true", "yes"}
+
+
+class StartupProfile:
+    # Named startup phases as offsets from `started` (taken at the top of main.py). Only
+    # the first mark of each phase counts, and a disabled profile ignores everything, so
+    # the UI can mark unconditionally. Marks may come from worker threads.
+    def __init__(self, started: float | None = None, enabled: bool = True):
+        self.started = time.perf_counter() if started is None else started
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._marks: list[tuple[str, float]] = []
+        self._reported = False
+
+    def mark(self, phase: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if all(name != phase for name, _ in self._marks):
+                self._marks.append((phase, now))
+
+    def report(self, stream=None) -> None:
+        with self._lock:
+            if not self.enabled or self._reported:
+                return
+            self._reported = True
+            marks = sorted(self._marks, key=lambda mark: mark[1])
+
+        stream = sys.stderr if stream is None else stream
+        width = max((len(name) for name, _ in marks), default=0)
+        print("startup profile (ms since start, +ms since previous phase):", file=stream)
+        previous = self.started
+        for name, at in marks:
+            print(
+                f"  {name:<{width}}  {(at - self.started) * 1000:8.1f}  +{(at - previous) * 1000:.1f}",
+                file=stream,
+            )
+            previous = at
+        stream.flush()
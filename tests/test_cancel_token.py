@@ -0,0 +1,59 @@
+import importlib.util
+import socket
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_spec = importlib.util.spec_from_file_location("weather_api_local", ROOT / "weather-api.py")
+weather_api = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(weather_api)
+
+CancelToken = weather_api.CancelToken
+RequestCancelled = weather_api.RequestCancelled
+
+
+def _closed_socket_shutdown():
+    sock = socket.socket()
+    sock.close()
+    return lambda: sock.shutdown(socket.SHUT_RDWR)
+
+
+class CancelTokenTest(unittest.TestCase):
+    def test_cancel_runs_callbacks(self):
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append("a"))
+        handle = token.on_cancel(lambda: calls.append("b"))
+        token.remove(handle)
+        token.cancel()
+        self.assertEqual(calls, ["a"])
+        self.assertTrue(token.cancelled)
+        with self.assertRaises(RequestCancelled):
+            token.check()
+
+    def test_cancel_ignores_closed_socket(self):
+        token = CancelToken()
+        token.on_cancel(_closed_socket_shutdown())
+        token.cancel()
+        self.assertTrue(token.cancelled)
+
+    def test_on_cancel_after_cancel_runs_callback(self):
+        token = CancelToken()
+        token.cancel()
+        calls = []
+        with self.assertRaises(RequestCancelled):
+            token.on_cancel(lambda: calls.append("late"))
+        self.assertEqual(calls, ["late"])
+
+    def test_on_cancel_after_cancel_ignores_closed_socket(self):
+        token = CancelToken()
+        token.cancel()
+        with self.assertRaises(RequestCancelled):
+            token.on_cancel(_closed_socket_shutdown())
+
+
+if __name__ == "__main__":
+    unittest.main()
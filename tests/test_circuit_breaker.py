@@ -0,0 +1,133 @@
+import asyncio
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_spec = importlib.util.spec_from_file_location("weather_api_local", ROOT / "weather-api.py")
+weather_api = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(weather_api)
+
+CircuitBreaker = weather_api.CircuitBreaker
+ProviderPolicy = weather_api.ProviderPolicy
+
+
+def _open_policy() -> ProviderPolicy:
+    # One failure opens the circuit and it half-opens straight away, so the next call is
+    # the probe.
+    policy = ProviderPolicy("Test", rate=1000.0, burst=1000.0, attempts=1, failure_threshold=1, reset_timeout=0.0)
+    policy.breaker.record_failure()
+    return policy
+
+
+def _ok():
+    return 200, {}
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_half_open_allows_one_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+    def test_probe_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_probe_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+        breaker.record_failure()
+        breaker._opened_at -= 60.0
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_released_probe_can_be_retaken(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.release_probe()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+
+
+class ProviderPolicyProbeTest(unittest.TestCase):
+    def _assert_recovers(self, policy: ProviderPolicy):
+        self.assertEqual(policy.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(policy.call(_ok), (200, {}))
+        self.assertEqual(policy.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_cancelled_probe_releases_slot(self):
+        policy = _open_policy()
+
+        def cancelled():
+            raise weather_api.RequestCancelled("Request was superseded.")
+
+        with self.assertRaises(weather_api.RequestCancelled):
+            policy.call(cancelled)
+        self._assert_recovers(policy)
+
+    def test_unexpected_error_releases_slot(self):
+        policy = _open_policy()
+
+        def broken():
+            raise ValueError("bad payload")
+
+        with self.assertRaises(ValueError):
+            policy.call(broken)
+        self._assert_recovers(policy)
+
+    def test_async_cancelled_probe_releases_slot(self):
+        policy = _open_policy()
+
+        async def main():
+            async def slow():
+                await asyncio.sleep(10)
+                return 200, {}
+
+            task = asyncio.ensure_future(policy.call_async(slow))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            async def ok():
+                return 200, {}
+
+            return await policy.call_async(ok)
+
+        self.assertEqual(asyncio.run(main()), (200, {}))
+        self.assertEqual(policy.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_async_superseded_probe_is_not_a_failure(self):
+        policy = _open_policy()
+
+        async def cancelled():
+            raise weather_api.RequestCancelled("Request was superseded.")
+
+        with self.assertRaises(weather_api.RequestCancelled):
+            asyncio.run(policy.call_async(cancelled))
+        self._assert_recovers(policy)
+
+
+if __name__ == "__main__":
+    unittest.main()
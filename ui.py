@@ -2,46 +2,79 @@ from __future__ import annotations
 
 import importlib.util
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import gi
 
 gi.require_version("Gtk", "4.0")
-from gi.repository import GLib, Gtk
+from gi.repository import Gdk, Gio, GLib, Gtk
 
-from settings import load_settings, save_settings
+from autocomplete import REMOTE_DELAY_MS, REMOTE_MIN_CHARS, CityIndex, location_label, merge_suggestions
+from gazetteer import parse_coordinates
+from settings import SettingsStore
 from gtk_style import install_material_smooth_css
+from prefetch import FavoritesPrefetcher
+from history import HistoryStore
+from snapshots import SnapshotStore, format_as_of, stale_as_of
+from startup import StartupProfile
+from units import CANONICAL_UNITS, convert_current, convert_forecast
 
-
-def _load_weather_module():
-    path = Path(__file__).with_name("weather-api.py")
-    spec = importlib.util.spec_from_file_location("weather_api_local", path)
-    if spec is None or spec.loader is None:
-        raise RuntimeError("Failed to load weather-api.py")
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+_weather_api = None
+_weather_api_lock = threading.Lock()
 
 
-weather_api = _load_weather_module()
-WeatherClient = weather_api.WeatherClient
-WeatherAPIError = weather_api.WeatherAPIError
+def _load_weather_module():
+    # Loaded on first use, normally on the refresh executor once the window is up: it
+    # pulls in asyncio, ssl and http.client, which dominate a cold start.
+    global _weather_api
+    with _weather_api_lock:
+        if _weather_api is None:
+            path = Path(__file__).with_name("weather-api.py")
+            spec = importlib.util.spec_from_file_location("weather_api_local", path)
+            if spec is None or spec.loader is None:
+                raise RuntimeError("Failed to load weather-api.py")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _weather_api = module
+        return _weather_api
 
 
 class WeatherApp(Gtk.Application):
-    def __init__(self):
+    def __init__(self, profile: StartupProfile | None = None):
         super().__init__(application_id="org.evans.Weather")
         self.window: Gtk.ApplicationWindow | None = None
+        self.profile = profile if profile is not None else StartupProfile(enabled=False)
 
-        self.settings = load_settings()
+        self.settings = SettingsStore()
+        self._settings_monitor: Gio.FileMonitor | None = None
         self.theme_values = ["dark", "light"]
         self.units_values = ["imperial", "metric"]
         self.css_provider = None
 
         self.client = None
+        self.prefetcher: FavoritesPrefetcher | None = None
+        self.snapshots = SnapshotStore()
+        self.history = HistoryStore()
         self._request_token = 0
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-refresh")
+        self._active_future: Future | None = None
+        self._active_cancel = None
+        self.refresh_stats = {"completed": 0, "abandoned": 0}
+        # What is on screen, in CANONICAL_UNITS, so a units switch only re-renders it.
+        self._displayed: tuple[dict, list[dict], float | None] | None = None
+
+        # Suggestions come from the local index as the city is typed; the geocoder is only
+        # asked after a pause, and a newer keystroke cancels that request.
+        self.city_index = CityIndex()
+        self._suggest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="city-suggest")
+        self._suggest_timer: int | None = None
+        self._suggest_cancel = None
+        self._suggest_paused = False
 
         self.city_entry: Gtk.Entry | None = None
+        self.suggestion_popover: Gtk.Popover | None = None
+        self.suggestion_list: Gtk.ListBox | None = None
         self.units_dropdown: Gtk.DropDown | None = None
         self.theme_dropdown: Gtk.DropDown | None = None
 
@@ -50,34 +83,130 @@ class WeatherApp(Gtk.Application):
         self.remove_btn: Gtk.Button | None = None
 
         self.current_label: Gtk.Label | None = None
+        self.as_of_label: Gtk.Label | None = None
         self.forecast_list: Gtk.ListBox | None = None
         self.favorites_list: Gtk.ListBox | None = None
         self.status_label: Gtk.Label | None = None
 
-        self._init_client()
-
     def do_activate(self):
         if self.window is None:
             self._build_ui()
             self._refresh_favorites_ui()
+            self._watch_settings()
             city = self.settings.get("city", "New York")
-            if self.city_entry is not None:
-                self.city_entry.set_text(city)
-            if self.client is not None:
-                self.refresh_weather()
+            self._set_city_text(city)
+            self._paint_snapshot(city)
+            self.window.add_tick_callback(self._on_first_frame)
         self.window.present()
 
+    def _on_first_frame(self, _widget, _clock):
+        # Tick callbacks run before the frame is drawn; the idle runs after it.
+        GLib.idle_add(self._on_first_paint)
+        return GLib.SOURCE_REMOVE
+
+    def _on_first_paint(self):
+        self.profile.mark("first paint")
+        # The client (and the weather module behind it) is only set up once the window
+        # is on screen, and off the main loop.
+        self._executor.submit(lambda: GLib.idle_add(self._on_client_ready, self._create_client()))
+        return False
+
+    def _on_client_ready(self, client):
+        self.profile.mark("client setup")
+        if self.client is not None:
+            # A refresh before this finished already built one.
+            return False
+        self.client = client
+        if client is None:
+            self._set_status("Open-Meteo fallback is active; OPENWEATHER_API_KEY is optional.")
+            return False
+        self.refresh_weather()
+        self._start_prefetcher()
+        self._suggest_executor.submit(self._load_city_index, client)
+        return False
+
+    def _load_city_index(self, client):
+        # Off the main loop: reads the geocode cache and builds the gazetteer's prefix table.
+        if client.gazetteer is not None:
+            client.gazetteer.warm()
+        # The Windows client has no geocode cache.
+        geocode_cache = getattr(client, "geocode_cache", None)
+        self.city_index.load(
+            favorites=self.settings.get("favorites", []),
+            recent=geocode_cache.recent() if geocode_cache is not None else [],
+            gazetteer=client.gazetteer,
+        )
+
+    def do_shutdown(self):
+        self.profile.report()
+        self._supersede_request()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._cancel_remote_suggestions()
+        self._suggest_executor.shutdown(wait=False, cancel_futures=True)
+        if self.suggestion_popover is not None:
+            self.suggestion_popover.unparent()
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        self.snapshots.close()
+        self.history.close()
+        if self._settings_monitor is not None:
+            self._settings_monitor.cancel()
+        self.settings.close()
+        Gtk.Application.do_shutdown(self)
+
+    @staticmethod
+    def _create_client():
+        weather_api = _load_weather_module()
+        try:
+            return weather_api.WeatherClient(stale_while_revalidate=True)
+        except weather_api.WeatherAPIError:
+            return None
+
     def _init_client(self):
+        self.client = self._create_client()
+        if self.prefetcher is not None:
+            self.prefetcher.client = self.client
+        if self.client is not None:
+            self._suggest_executor.submit(self._load_city_index, self.client)
+
+    def _watch_settings(self):
+        # Another running instance (GTK, Qt or the CLI) may rewrite settings.json; follow it.
+        self.settings.subscribe(self._on_setting_changed, "units", "theme", "favorites")
         try:
-            self.client = WeatherClient()
-        except WeatherAPIError:
-            self.client = None
+            gfile = Gio.File.new_for_path(str(self.settings.path))
+            self._settings_monitor = gfile.monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except GLib.Error:
+            return
+        self._settings_monitor.connect("changed", lambda *_args: self.settings.reload())
+
+    def _on_setting_changed(self, key: str, value):
+        # Also runs for our own changes; every branch is a no-op when the UI already agrees.
+        if key == "units" and self.units_dropdown is not None:
+            self._set_dropdown_value(self.units_dropdown, self.units_values, value)
+        elif key == "theme" and self.theme_dropdown is not None:
+            self._set_dropdown_value(self.theme_dropdown, self.theme_values, value)
+        elif key == "favorites":
+            self._refresh_favorites_ui()
+            self.city_index.set_favorites(value)
+            if self.prefetcher is not None:
+                self.prefetcher.set_cities(value)
+
+    def _start_prefetcher(self):
+        if self.prefetcher is not None or self.client is None:
+            return
+        self.prefetcher = FavoritesPrefetcher(
+            self.client,
+            interval=float(self.settings.get("prefetch_interval", 600)),
+            on_update=self._on_prefetch_update,
+        )
+        self.prefetcher.start(self.settings.get("favorites", []), CANONICAL_UNITS)
 
     def _build_ui(self):
         self.window = Gtk.ApplicationWindow(application=self)
         self.window.set_title("Weather Dashboard")
         self.window.set_default_size(1100, 760)
         self.css_provider = install_material_smooth_css(self.window)
+        self.profile.mark("css install")
 
         root = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         root.set_margin_top(12)
@@ -103,8 +232,23 @@ class WeatherApp(Gtk.Application):
         self.city_entry.set_hexpand(True)
         self.city_entry.set_placeholder_text("Enter city")
         self.city_entry.connect("activate", lambda _e: self.refresh_weather())
+        self.city_entry.connect("changed", self._on_city_changed)
+        keys = Gtk.EventControllerKey()
+        keys.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        keys.connect("key-pressed", self._on_city_key)
+        self.city_entry.add_controller(keys)
         controls.append(self.city_entry)
 
+        self.suggestion_list = Gtk.ListBox()
+        self.suggestion_list.connect("row-activated", self._on_suggestion_activated)
+        self.suggestion_popover = Gtk.Popover()
+        self.suggestion_popover.set_child(self.suggestion_list)
+        self.suggestion_popover.set_parent(self.city_entry)
+        self.suggestion_popover.set_position(Gtk.PositionType.BOTTOM)
+        self.suggestion_popover.set_has_arrow(False)
+        # Typing continues in the entry while the list is up.
+        self.suggestion_popover.set_autohide(False)
+
         self.refresh_btn = Gtk.Button(label="Refresh")
         self.refresh_btn.connect("clicked", lambda _b: self.refresh_weather())
         controls.append(self.refresh_btn)
@@ -158,6 +302,12 @@ class WeatherApp(Gtk.Application):
         self.current_label.set_wrap(True)
         current_box.append(self.current_label)
 
+        self.as_of_label = Gtk.Label()
+        self.as_of_label.set_xalign(0.0)
+        self.as_of_label.add_css_class("dim-label")
+        self.as_of_label.set_visible(False)
+        current_box.append(self.as_of_label)
+
         forecast_frame = Gtk.Frame(label="5-Day Forecast")
         left.append(forecast_frame)
 
@@ -192,9 +342,7 @@ class WeatherApp(Gtk.Application):
         root.append(self.status_label)
 
         self._apply_theme(self.settings.get("theme", "dark"))
-
-        if self.client is None:
-            self._set_status("Open-Meteo fallback is active; OPENWEATHER_API_KEY is optional.")
+        self.profile.mark("ui build")
 
     def _set_status(self, text: str):
         if self.status_label is not None:
@@ -204,8 +352,6 @@ class WeatherApp(Gtk.Application):
         for button in (self.refresh_btn, self.save_btn, self.remove_btn):
             if button is not None:
                 button.set_sensitive(not is_loading)
-        if self.units_dropdown is not None:
-            self.units_dropdown.set_sensitive(not is_loading)
         if self.theme_dropdown is not None:
             self.theme_dropdown.set_sensitive(not is_loading)
 
@@ -223,14 +369,143 @@ class WeatherApp(Gtk.Application):
         if not isinstance(child, Gtk.Label):
             return
         city = child.get_text()
-        if self.city_entry is not None:
-            self.city_entry.set_text(city)
+        self._set_city_text(city)
+
+        if self.prefetcher is not None:
+            self.prefetcher.prioritize(city)
+            cached = self.prefetcher.get(city, CANONICAL_UNITS)
+            if cached is not None:
+                # Drop any in-flight refresh and paint the prefetched bundle right away.
+                self._supersede_request()
+                _, bundle = cached
+                self._render_weather(bundle["current"], bundle["forecast"], as_of=self._stale_as_of(bundle))
+                self._set_loading(False)
+                self._set_status(f"Showing saved weather for {bundle['current']['city']}")
+                return
+        self.refresh_weather()
+
+    def _set_city_text(self, text: str):
+        # Programmatic changes are not typing and must not pop up suggestions.
+        if self.city_entry is None:
+            return
+        self._suggest_paused = True
+        try:
+            self.city_entry.set_text(text)
+            self.city_entry.set_position(-1)
+        finally:
+            self._suggest_paused = False
+        self._hide_suggestions()
+
+    def _on_city_changed(self, entry: Gtk.Entry):
+        if self._suggest_paused:
+            return
+        self._cancel_remote_suggestions()
+        text = entry.get_text()
+        local = self.city_index.suggest(text)
+        self._show_suggestions(local)
+        specific = len(" ".join(text.split())) >= REMOTE_MIN_CHARS
+        if specific and len(local) < self.city_index.limit and self.client is not None:
+            self._suggest_timer = GLib.timeout_add(REMOTE_DELAY_MS, self._fetch_remote_suggestions, text)
+
+    def _on_city_key(self, _controller, keyval: int, _keycode: int, _state) -> bool:
+        if self.suggestion_popover is None or not self.suggestion_popover.get_visible():
+            return False
+        if keyval == Gdk.KEY_Escape:
+            self._cancel_remote_suggestions()
+            self._hide_suggestions()
+            return True
+        if keyval == Gdk.KEY_Down:
+            row = self.suggestion_list.get_row_at_index(0)
+            if row is not None:
+                row.grab_focus()
+                return True
+        return False
+
+    def _cancel_remote_suggestions(self):
+        if self._suggest_timer is not None:
+            GLib.source_remove(self._suggest_timer)
+            self._suggest_timer = None
+        if self._suggest_cancel is not None:
+            self._suggest_cancel.cancel()
+            self._suggest_cancel = None
+
+    def _fetch_remote_suggestions(self, text: str):
+        self._suggest_timer = None
+        weather_api = _load_weather_module()
+        cancel = weather_api.CancelToken()
+        client = self.client
+        limit = self.city_index.limit
+
+        def task():
+            with cancel.bound():
+                try:
+                    locations = client.search_cities(text, limit)
+                except weather_api.WeatherAPIError:
+                    return
+            GLib.idle_add(self._on_remote_suggestions, cancel, text, [location_label(loc) for loc in locations])
+
+        self._suggest_cancel = cancel
+        self._suggest_executor.submit(task)
+        return GLib.SOURCE_REMOVE
+
+    def _on_remote_suggestions(self, cancel, text: str, remote: list[str]):
+        if cancel is not self._suggest_cancel or cancel.cancelled:
+            return False
+        self._suggest_cancel = None
+        self._show_suggestions(merge_suggestions(self.city_index.suggest(text), remote, self.city_index.limit))
+        return False
+
+    def _show_suggestions(self, suggestions: list[str]):
+        if self.suggestion_list is None or self.suggestion_popover is None:
+            return
+        self._clear_listbox(self.suggestion_list)
+        for text in suggestions:
+            row = Gtk.ListBoxRow()
+            row.set_child(Gtk.Label(label=text, xalign=0.0))
+            self.suggestion_list.append(row)
+        if suggestions:
+            self.suggestion_popover.popup()
+        else:
+            self.suggestion_popover.popdown()
+
+    def _hide_suggestions(self):
+        if self.suggestion_popover is not None:
+            self.suggestion_popover.popdown()
+
+    def _on_suggestion_activated(self, _listbox: Gtk.ListBox, row: Gtk.ListBoxRow):
+        child = row.get_child()
+        if not isinstance(child, Gtk.Label):
+            return
+        self._set_city_text(child.get_text())
+        self.city_entry.grab_focus()
         self.refresh_weather()
 
+    def _paint_snapshot(self, city: str):
+        snapshot = self.snapshots.get(city, CANONICAL_UNITS)
+        if snapshot is not None:
+            fetched_at, bundle = snapshot
+            self._render_weather(bundle["current"], bundle["forecast"], as_of=fetched_at)
+
+    def _on_prefetch_update(self, city: str, units: str, bundle: dict):
+        # Runs on a prefetch worker, so the snapshot and history writes stay off the main loop.
+        self.snapshots.put(city, units, bundle)
+        self.history.append(city, bundle["current"], units, bundle.get("fetched_at"))
+        GLib.idle_add(self._on_prefetched, city, units, bundle)
+
+    def _on_prefetched(self, city: str, _units: str, bundle: dict):
+        if self.city_entry is None:
+            return False
+        shown_city = self.city_entry.get_text().strip().casefold()
+        in_flight = self.refresh_btn is not None and not self.refresh_btn.get_sensitive()
+        if city.casefold() == shown_city and not in_flight:
+            self._render_weather(bundle["current"], bundle["forecast"], as_of=self._stale_as_of(bundle))
+        return False
+
     def _on_units_changed(self, dropdown: Gtk.DropDown, _param):
         value = self._get_dropdown_value(dropdown, self.units_values)
-        self.settings["units"] = value
-        save_settings(self.settings)
+        self.settings.set("units", value)
+        if self._displayed is not None:
+            self._render_weather(*self._displayed)
 
     def _on_theme_changed(self, dropdown: Gtk.DropDown, _param):
         value = self._get_dropdown_value(dropdown, self.theme_values)
@@ -240,8 +515,7 @@ class WeatherApp(Gtk.Application):
         if theme_name not in {"dark", "light"}:
             theme_name = "dark"
 
-        self.settings["theme"] = theme_name
-        save_settings(self.settings)
+        self.settings.set("theme", theme_name)
 
         gtk_settings = Gtk.Settings.get_default()
         if gtk_settings is not None:
@@ -254,16 +528,15 @@ class WeatherApp(Gtk.Application):
         if not city:
             return
 
-        favorites = self.settings.setdefault("favorites", [])
+        favorites = self.settings.get("favorites", [])
         if city not in favorites:
             favorites.append(city)
 
+        changes = {"favorites": favorites, "city": city}
         if self.units_dropdown is not None:
-            self.settings["units"] = self._get_dropdown_value(self.units_dropdown, self.units_values)
-        self.settings["city"] = city
-        save_settings(self.settings)
-
-        self._refresh_favorites_ui()
+            changes["units"] = self._get_dropdown_value(self.units_dropdown, self.units_values)
+        # The favorites subscriber refreshes the list and the prefetcher.
+        self.settings.update(changes)
         self._set_status(f"Saved city: {city}")
 
     def remove_selected_city(self):
@@ -279,11 +552,10 @@ class WeatherApp(Gtk.Application):
             return
         city = child.get_text()
 
-        favorites = self.settings.setdefault("favorites", [])
+        favorites = self.settings.get("favorites", [])
         if city in favorites:
             favorites.remove(city)
-            save_settings(self.settings)
-            self._refresh_favorites_ui()
+            self.settings.set("favorites", favorites)
             self._set_status(f"Removed city: {city}")
 
     def refresh_weather(self):
@@ -291,7 +563,8 @@ class WeatherApp(Gtk.Application):
             return
 
         city = self.city_entry.get_text().strip()
-        units = self._get_dropdown_value(self.units_dropdown, self.units_values)
+        self._cancel_remote_suggestions()
+        self._hide_suggestions()
         if not city:
             self._set_status("Enter a city first")
             return
@@ -299,8 +572,7 @@ class WeatherApp(Gtk.Application):
         self._set_loading(True)
         self._set_status(f"Fetching weather for {city}...")
 
-        self._request_token += 1
-        token = self._request_token
+        token = self._supersede_request()
 
         if self.client is None:
             self._init_client()
@@ -308,20 +580,85 @@ class WeatherApp(Gtk.Application):
                 self._set_loading(False)
                 self._set_status("No weather provider could be initialized")
                 return
+        self._start_prefetcher()
+
+        weather_api = _load_weather_module()
+        cancel = weather_api.CancelToken()
+        client = self.client
 
         def task():
-            try:
-                current = self.client.current_weather(city, units)
-                forecast = self.client.five_day_forecast(city, units)
-                GLib.idle_add(self._on_weather_ready, token, current, forecast, units)
-            except WeatherAPIError as exc:
-                GLib.idle_add(self._on_weather_error, token, str(exc))
+            with cancel.bound():
+                try:
+                    bundle = client.fetch_bundle(city, CANONICAL_UNITS)
+                except weather_api.RequestCancelled as exc:
+                    GLib.idle_add(self._on_weather_error, token, str(exc), None)
+                    return
+                except weather_api.WeatherAPIError as exc:
+                    snapshot = self.snapshots.get(city, CANONICAL_UNITS)
+                    GLib.idle_add(self._on_weather_error, token, str(exc), snapshot)
+                    return
+            if self.prefetcher is not None:
+                self.prefetcher.put(city, CANONICAL_UNITS, bundle)
+            # Both are stamped with the bundle's fetch time, not now: a stale cache entry
+            # served while offline must not pass for a fresh observation.
+            self.snapshots.put(city, CANONICAL_UNITS, bundle)
+            self.history.append(city, bundle["current"], CANONICAL_UNITS, bundle.get("fetched_at"))
+            as_of = self._stale_as_of(bundle)
+            GLib.idle_add(self._on_weather_ready, token, bundle["current"], bundle["forecast"], as_of)
+
+        self._active_cancel = cancel
+        self._active_future = self._executor.submit(task)
+
+    def _supersede_request(self) -> int:
+        # Abort the refresh in flight: its socket is closed and its remaining steps are
+        # skipped, so quick clicks through favorites do not pile up blocking fetches.
+        future = self._active_future
+        if future is not None and not future.done():
+            # A refresh that never started is counted here; one that did reports back
+            # with its now-stale token and is counted by the handler instead.
+            if future.cancel():
+                self.refresh_stats["abandoned"] += 1
+            if self._active_cancel is not None:
+                self._active_cancel.cancel()
+        self._active_future = None
+        self._active_cancel = None
+        self._request_token += 1
+        return self._request_token
 
-        threading.Thread(target=task, daemon=True).start()
+    def _stale_as_of(self, bundle: dict) -> float | None:
+        return stale_as_of(bundle, _load_weather_module().CURRENT_TTL_SECONDS)
 
-    def _on_weather_ready(self, token: int, current: dict, forecast: list[dict], units: str):
+    def _on_weather_ready(self, token: int, current: dict, forecast: list[dict], as_of: float | None = None):
         if token != self._request_token:
+            self.refresh_stats["abandoned"] += 1
             return False
+        self.refresh_stats["completed"] += 1
+        self.profile.mark("first data")
+        self.profile.report()
+
+        self._render_weather(current, forecast, as_of=as_of)
+
+        entered = self.city_entry.get_text().strip()
+        if parse_coordinates(entered) is not None:
+            # Keep the exact point; the label only names the nearest place.
+            self.settings.set("city", entered)
+        else:
+            self.settings.set("city", current.get("city", entered))
+            if current.get("city"):
+                self.city_index.add_recent(current["city"])
+
+        self._set_loading(False)
+        if as_of is not None:
+            self._set_status(f"Showing weather for {current['city']} {format_as_of(as_of)}")
+        else:
+            self._set_status(f"Updated weather for {current['city']}")
+        return False
+
+    def _render_weather(self, current: dict, forecast: list[dict], as_of: float | None = None):
+        self._displayed = (current, forecast, as_of)
+        units = self.settings.get("units", "imperial")
+        current = convert_current(current, units)
+        forecast = convert_forecast(forecast, units)
 
         temp_unit = "F" if units == "imperial" else "C"
         wind_unit = "mph" if units == "imperial" else "km/h"
@@ -341,6 +678,9 @@ class WeatherApp(Gtk.Application):
 
         if self.current_label is not None:
             self.current_label.set_text(summary)
+        if self.as_of_label is not None:
+            self.as_of_label.set_text(format_as_of(as_of) if as_of is not None else "")
+            self.as_of_label.set_visible(as_of is not None)
 
         if self.forecast_list is not None:
             self._clear_listbox(self.forecast_list)
@@ -353,19 +693,21 @@ class WeatherApp(Gtk.Application):
                 row.set_child(Gtk.Label(label=line, xalign=0.0))
                 self.forecast_list.append(row)
 
-        self.settings["city"] = current.get("city", self.city_entry.get_text().strip())
-        self.settings["units"] = units
-        save_settings(self.settings)
-
-        self._set_loading(False)
-        self._set_status(f"Updated weather for {current['city']}")
-        return False
-
-    def _on_weather_error(self, token: int, message: str):
+    def _on_weather_error(self, token: int, message: str, snapshot: tuple[float, dict] | None):
         if token != self._request_token:
+            self.refresh_stats["abandoned"] += 1
             return False
+        self.refresh_stats["completed"] += 1
+        self.profile.mark("first data")
+        self.profile.report()
         self._set_loading(False)
-        self._set_status(f"Weather error: {message}")
+        if snapshot is None:
+            self._set_status(f"Weather error: {message}")
+            return False
+
+        fetched_at, bundle = snapshot
+        self._render_weather(bundle["current"], bundle["forecast"], as_of=fetched_at)
+        self._set_status(f"Offline, showing weather {format_as_of(fetched_at)} ({message})")
         return False
 
     @staticmethod
@@ -0,0 +1,74 @@
+from array import array
+
+# Providers are always asked for metric data, and caches, snapshots and history hold it
+# that way; imperial is derived locally so switching units never costs a request.
+CANONICAL_UNITS = "metric"
+
+_TEMP_KEYS = ("temp", "feels_like", "temp_min", "temp_max")
+_MPH_PER_KMH = 1 / 1.609344
+
+
+def celsius_to(value, units: str):
+    if value is None or units != "imperial":
+        return value
+    return value * 1.8 + 32
+
+
+def kmh_to(value, units: str):
+    if value is None or units != "imperial":
+        return value
+    return value * _MPH_PER_KMH
+
+
+def to_celsius(value, units: str):
+    if value is None or units != "imperial":
+        return value
+    return (value - 32) / 1.8
+
+
+def to_kmh(value, units: str):
+    if value is None or units != "imperial":
+        return value
+    return value * 1.609344
+
+
+def convert_current(current: dict, units: str) -> dict:
+    if units == CANONICAL_UNITS:
+        return current
+    converted = dict(current)
+    for key in _TEMP_KEYS:
+        if key in converted:
+            converted[key] = celsius_to(converted[key], units)
+    if "wind" in converted:
+        converted["wind"] = kmh_to(converted["wind"], units)
+    return converted
+
+
+def convert_forecast(forecast: list[dict], units: str) -> list[dict]:
+    if units == CANONICAL_UNITS:
+        return forecast
+    return [convert_current(day, units) for day in forecast]
+
+
+def convert_bundle(bundle: dict, units: str) -> dict:
+    if units == CANONICAL_UNITS:
+        return bundle
+    return {
+        **bundle,
+        "current": convert_current(bundle["current"], units),
+        "forecast": convert_forecast(bundle["forecast"], units),
+    }
+
+
+def convert_temperature_column(column: array, units: str) -> array:
+    # A new column, built element by element: O(n) in Python, so callers convert a
+    # column once rather than per read. NaN (missing) stays NaN through the arithmetic.
+    if units != "imperial":
+        return column
+    return array("d", [value * 1.8 + 32 for value in column])
+
+
+def convert_wind_column(column: array, units: str) -> array:
+    if units != "imperial":
+        return column
+    return array("d", [value * _MPH_PER_KMH for value in column])
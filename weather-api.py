@@ -1,53 +1,780 @@
+import asyncio
+import bisect
+import contextlib
+import contextvars
 import os
 import json
-from typing import Dict, List
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+import http.client
+import math
+import random
+import socket
+import ssl
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+from urllib.parse import urlencode, urlsplit
+
+from autocomplete import location_label
+from gazetteer import Gazetteer, default_gazetteer, parse_coordinates, resolve_coordinates
+from geocache import NOT_FOUND, GeocodeCache, normalize_city
+from units import (
+    CANONICAL_UNITS,
+    convert_bundle,
+    convert_current,
+    convert_forecast,
+    convert_temperature_column,
+    convert_wind_column,
+)
 
 BASE_URL = "https://api.openweathermap.org/data/2.5"
 OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 OPEN_METEO_GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+SUGGESTED_LOCATIONS = 256
+
+OPEN_METEO_BATCH_SIZE = 100
+HOURLY_FORECAST_DAYS = 16
+
+HEDGE_DEFAULT_DELAY = 1.5
+
+# Bodies are read and inflated in pieces of this size; anything that inflates past
+# MAX_DECODED_BYTES is rejected rather than buffered.
+READ_CHUNK_BYTES = 64 * 1024
+MAX_DECODED_BYTES = 32 * 1024 * 1024
+
+CURRENT_TTL_SECONDS = 10 * 60
+DAILY_TTL_SECONDS = 60 * 60
+
+# Open-Meteo forecasts can be cached per cell of this many degrees, so nearby places share
+# one request: the first place asked for in a cell is fetched at its exact coordinates and
+# the others in that cell are served its forecast until it expires. Off (0, exact
+# coordinates only) unless WEATHER_FORECAST_GRID opts in.
+FORECAST_GRID_DEGREES = 0.0
 
 
 class WeatherAPIError(Exception):
+    def __init__(self, message: str = "", status: int | None = None, retryable: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+
+class CircuitOpenError(WeatherAPIError):
+    pass
+
+
+class RequestCancelled(WeatherAPIError):
     pass
 
 
+_current_cancel_token: contextvars.ContextVar["CancelToken | None"] = contextvars.ContextVar(
+    "weather_cancel_token", default=None
+)
+
+
+class CancelToken:
+    # Bound to a worker with `with token.bound():`. Every HTTP call made inside checks it
+    # before starting and registers its socket, so cancel() aborts the request in flight
+    # and makes the remaining steps (e.g. the forecast after a geocode) raise RequestCancelled.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._next_handle = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except OSError:
+                pass
+
+    def check(self) -> None:
+        if self._cancelled:
+            raise RequestCancelled("Request was superseded.")
+
+    def on_cancel(self, callback: Callable[[], None]) -> int:
+        with self._lock:
+            if not self._cancelled:
+                self._next_handle += 1
+                self._callbacks[self._next_handle] = callback
+                return self._next_handle
+        # Already cancelled: run it now, as cancel() would have, and with the same guard.
+        try:
+            callback()
+        except OSError:
+            pass
+        raise RequestCancelled("Request was superseded.")
+
+    def remove(self, handle: int) -> None:
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    @contextlib.contextmanager
+    def bound(self):
+        reset = _current_cancel_token.set(self)
+        try:
+            yield self
+        finally:
+            _current_cancel_token.reset(reset)
+
+
+def _abort_connection(conn: http.client.HTTPConnection) -> None:
+    # shutdown() wakes a thread blocked in recv() on this socket; close() alone may not.
+    if conn.sock is not None:
+        conn.sock.shutdown(socket.SHUT_RDWR)
+
+
+def _is_retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class _BodyDecoder:
+    # Inflates a gzip/deflate body chunk by chunk as it comes off the socket, and counts
+    # bytes on the wire versus bytes handed to the JSON parser.
+    def __init__(self, content_encoding: str | None):
+        self.encoding = (content_encoding or "identity").strip().lower()
+        if self.encoding in ("gzip", "x-gzip"):
+            self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._inflater = zlib.decompressobj()
+        elif self.encoding == "identity":
+            self._inflater = None
+        else:
+            raise http.client.HTTPException(f"Unsupported Content-Encoding: {self.encoding}")
+        self._parts: list[bytes] = []
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.content = b""
+
+    def feed(self, chunk: bytes) -> None:
+        first = self.wire_bytes == 0
+        self.wire_bytes += len(chunk)
+        if self._inflater is None:
+            self._append(chunk)
+            return
+        try:
+            self._append(self._inflater.decompress(chunk))
+        except zlib.error as exc:
+            if not (first and self.encoding == "deflate"):
+                raise http.client.HTTPException(f"Corrupt {self.encoding} body: {exc}") from exc
+            # Some servers send raw deflate without the zlib header that RFC 9110 asks for.
+            self._inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+            self._append(self._inflater.decompress(chunk))
+
+    def _append(self, data: bytes) -> None:
+        if not data:
+            return
+        self.decoded_bytes += len(data)
+        if self.decoded_bytes > MAX_DECODED_BYTES:
+            raise http.client.HTTPException("Response body is too large.")
+        self._parts.append(data)
+
+    def finish(self) -> bytes:
+        if self._inflater is not None:
+            try:
+                self._append(self._inflater.flush())
+            except zlib.error as exc:
+                raise http.client.HTTPException(f"Corrupt {self.encoding} body: {exc}") from exc
+        self.content = b"".join(self._parts)
+        self._parts = []
+        return self.content
+
+
+class _TransferStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"responses": 0, "compressed_responses": 0, "wire_bytes": 0, "decoded_bytes": 0}
+
+    def record(self, decoder: _BodyDecoder) -> None:
+        with self._lock:
+            self._counts["responses"] += 1
+            if decoder.encoding != "identity":
+                self._counts["compressed_responses"] += 1
+            self._counts["wire_bytes"] += decoder.wire_bytes
+            self._counts["decoded_bytes"] += decoder.decoded_bytes
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+class _ConnectionPool:
+    # Keep-alive connections are kept per (scheme, host, port) so repeated refreshes
+    # reuse the same TCP/TLS session instead of handshaking on every request.
+    def __init__(self, max_per_host: int = 4, idle_timeout: float = 30.0):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: dict[tuple, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._slots: dict[tuple, threading.BoundedSemaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        self.transfer = _TransferStats()
+
+    def _slot(self, key: tuple) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._slots[key] = slot
+            return slot
+
+    def _checkout(self, key: tuple, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used < self.idle_timeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+
+        scheme, host, port = key
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        return conn, False
+
+    def _checkin(self, key: tuple, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+
+    def request(
+        self, url: str, headers: dict, timeout: float, token: CancelToken | None = None
+    ) -> tuple[int, bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        slot = self._slot(key)
+        if not slot.acquire(timeout=timeout):
+            raise TimeoutError(f"No free connection to {parts.hostname} within {timeout}s")
+        try:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                status, body, will_close = self._send(conn, path, headers, token)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                if not reused or (token is not None and token.cancelled):
+                    raise
+                # The server dropped an idle keep-alive socket; retry once on a fresh one.
+                conn, _ = self._checkout_fresh(key, timeout)
+                status, body, will_close = self._send(conn, path, headers, token)
+
+            if will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            self.transfer.record(body)
+            return status, body.content
+        finally:
+            slot.release()
+
+    def _checkout_fresh(self, key: tuple, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            for conn, _ in self._idle.pop(key, []):
+                conn.close()
+        return self._checkout(key, timeout)
+
+    @staticmethod
+    def _send(
+        conn: http.client.HTTPConnection, path: str, headers: dict, token: CancelToken | None
+    ) -> tuple[int, _BodyDecoder, bool]:
+        handle = None
+        try:
+            if token is not None:
+                handle = token.on_cancel(lambda: _abort_connection(conn))
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = _BodyDecoder(response.getheader("Content-Encoding"))
+            while True:
+                chunk = response.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                body.feed(chunk)
+            body.finish()
+            if token is not None:
+                token.check()
+        except BaseException:
+            conn.close()
+            raise
+        finally:
+            if handle is not None:
+                token.remove(handle)
+        return response.status, body, response.will_close
+
+    def stats(self) -> dict:
+        return self.transfer.snapshot()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+
+_POOL = _ConnectionPool(
+    max_per_host=int(os.getenv("WEATHER_HTTP_POOL_SIZE", "4")),
+    idle_timeout=float(os.getenv("WEATHER_HTTP_IDLE_TIMEOUT", "30")),
+)
+
+
 def _http_json_request(url: str, params: dict, timeout: int = 10) -> tuple[int, dict]:
     query = urlencode(params)
     full_url = f"{url}?{query}" if query else url
-    request = Request(
-        full_url,
-        headers={
-            "User-Agent": "WeatherDashboard/1.0",
-            "Accept": "application/json",
-        },
-    )
-
-    status = 0
-    raw = b""
+    headers = {
+        "User-Agent": "WeatherDashboard/1.0",
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+    token = _current_cancel_token.get()
+    if token is not None:
+        token.check()
     try:
-        with urlopen(request, timeout=timeout) as response:
-            status = response.getcode() or 200
-            raw = response.read()
-    except HTTPError as exc:
-        status = exc.code
-        raw = exc.read()
-    except URLError as exc:
-        raise WeatherAPIError(f"Network/API error: {exc.reason}") from exc
-    except OSError as exc:
-        raise WeatherAPIError(f"Network/API error: {exc}") from exc
+        status, raw = _POOL.request(full_url, headers, timeout, token)
+    except (OSError, http.client.HTTPException) as exc:
+        if token is not None and token.cancelled:
+            raise RequestCancelled("Request was superseded.") from exc
+        raise WeatherAPIError(f"Network/API error: {exc}", retryable=True) from exc
+
+    return status, _decode_json(raw)
 
+
+def _select_json_decoder(name: str | None = None) -> tuple[str, Callable[[bytes], object]]:
+    # Every candidate takes the raw response bytes as-is; orjson and ujson parse them
+    # without building an intermediate str. WEATHER_JSON_BACKEND pins one (or "json").
+    preferred = (name or os.getenv("WEATHER_JSON_BACKEND") or "auto").strip().lower()
+    candidates = ("orjson", "ujson") if preferred == "auto" else (preferred,)
+    for candidate in candidates:
+        if candidate == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+            return "orjson", orjson.loads
+        if candidate == "ujson":
+            try:
+                import ujson
+            except ImportError:
+                continue
+            return "ujson", ujson.loads
+    return "json", json.loads
+
+
+JSON_BACKEND, _json_loads = _select_json_decoder()
+
+
+def _decode_json(raw: bytes) -> dict:
     if not raw:
-        return status, {}
+        return {}
 
     try:
-        payload = json.loads(raw.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        return _json_loads(raw)
+    except ValueError as exc:
+        # All three backends report bad input (including bad UTF-8) as a ValueError.
         raise WeatherAPIError("API returned invalid JSON response.") from exc
 
-    return status, payload
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # Takes a token now and returns how long the caller must wait before using it.
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        # The half-open probe ended without a verdict (cancelled, or an unexpected error);
+        # let the next call probe instead of leaving the circuit open for good.
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class ProviderPolicy:
+    # Wraps every HTTP call to one provider: waits for a rate-limit token, refuses
+    # calls while the circuit is open, and retries 429/5xx/network failures with
+    # full-jitter exponential backoff.
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def _admit(self) -> float:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} is temporarily unavailable; skipping it for now.")
+        return self.bucket.reserve()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+    def _record(self, status: int) -> bool:
+        # Returns True when the response should be retried.
+        if _is_retryable_status(status):
+            self.breaker.record_failure()
+            return True
+        self.breaker.record_success()
+        return False
+
+    def call(self, fn: Callable[[], tuple[int, dict]]) -> tuple[int, dict]:
+        for attempt in range(self.attempts):
+            delay = self._admit()
+            last_try = attempt + 1 == self.attempts
+            try:
+                time.sleep(delay)
+                status, payload = fn()
+            except RequestCancelled:
+                self.breaker.release_probe()
+                raise
+            except WeatherAPIError:
+                self.breaker.record_failure()
+                if last_try:
+                    raise
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                if not self._record(status) or last_try:
+                    return status, payload
+            time.sleep(self._backoff(attempt))
+        raise AssertionError("unreachable")
+
+    async def call_async(self, fn: Callable[[], "asyncio.Future"]) -> tuple[int, dict]:
+        for attempt in range(self.attempts):
+            delay = self._admit()
+            last_try = attempt + 1 == self.attempts
+            try:
+                await asyncio.sleep(delay)
+                status, payload = await fn()
+            except RequestCancelled:
+                self.breaker.release_probe()
+                raise
+            except WeatherAPIError:
+                self.breaker.record_failure()
+                if last_try:
+                    raise
+            except BaseException:
+                # Includes asyncio.CancelledError from a hedge that lost the race.
+                self.breaker.release_probe()
+                raise
+            else:
+                if not self._record(status) or last_try:
+                    return status, payload
+            await asyncio.sleep(self._backoff(attempt))
+        raise AssertionError("unreachable")
+
+
+def _default_policies() -> dict[str, ProviderPolicy]:
+    # Free tiers: OpenWeather allows 60 calls/minute, Open-Meteo about 5000/hour.
+    return {
+        "openweather": ProviderPolicy("OpenWeather", rate=1.0, burst=60),
+        "open-meteo": ProviderPolicy("Open-Meteo", rate=5000 / 3600, burst=100),
+    }
+
+
+def _request(policy: ProviderPolicy | None, url: str, params: dict, timeout: int = 10) -> tuple[int, dict]:
+    if policy is None:
+        return _http_json_request(url, params, timeout)
+    return policy.call(lambda: _http_json_request(url, params, timeout))
+
+
+def _should_fail_over(exc: WeatherAPIError) -> bool:
+    return isinstance(exc, CircuitOpenError) or exc.retryable
+
+
+def _city_error(exc: BaseException) -> bool:
+    # forecast_many keeps a failure that is the city's own (e.g. an unknown name) as its
+    # value. An outage is raised instead, so WeatherClient fails the batch over as it
+    # would a single fetch rather than returning a batch of errors.
+    return isinstance(exc, WeatherAPIError) and not _should_fail_over(exc)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float, default: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return default
+        index = min(len(samples) - 1, round(pct / 100 * (len(samples) - 1)))
+        return samples[index]
+
+
+class ResponseCache:
+    # Keys look like (provider, endpoint, rounded lat/lon or city). Each lookup says
+    # whether it needs "current" or "daily" freshness, so one cached Open-Meteo payload can
+    # serve a five-day forecast long after its current conditions have gone stale.
+    def __init__(
+        self,
+        current_ttl: float = CURRENT_TTL_SECONDS,
+        daily_ttl: float = DAILY_TTL_SECONDS,
+        stale_while_revalidate: bool = False,
+        max_stale: float = 24 * 3600,
+        max_entries: int = 512,
+    ):
+        self.ttls = {"current": current_ttl, "daily": daily_ttl}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (monotonic store time for TTLs, wall-clock fetch time for display, payload,
+        # the point it was fetched for or None)
+        self._entries: OrderedDict[tuple, tuple[float, float, dict, tuple | None]] = OrderedDict()
+        self._refreshing: set[tuple] = set()
+        # Outcomes per "provider/endpoint", the first two elements of the key.
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def _count(self, key: tuple, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                f"{key[0]}/{key[1]}", {"hits": 0, "grid_hits": 0, "stale_hits": 0, "misses": 0}
+            )
+            counts[outcome] += 1
+
+    def _count_hit(self, key: tuple, entry: tuple, point: tuple | None) -> None:
+        # A grid hit serves a forecast fetched for another point in the same cell.
+        shared = point is not None and entry[3] is not None and entry[3] != point
+        self._count(key, "grid_hits" if shared else "hits")
+
+    def fetch(self, key: tuple, kind: str, loader: Callable[[], dict]) -> dict:
+        return self.fetch_entry(key, kind, loader)[1]
+
+    def fetch_entry(
+        self, key: tuple, kind: str, loader: Callable[[], dict], point: tuple | None = None
+    ) -> tuple[float, dict]:
+        # (time.time() of the fetch, payload): a stale-while-revalidate hit can be up to
+        # max_stale old, and callers that show or record it need to know.
+        ttl = self.ttls.get(kind, self.ttls["current"])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            stored_at, fetched_at, payload, _ = entry
+            age = time.monotonic() - stored_at
+            if age <= ttl:
+                self._count_hit(key, entry, point)
+                return fetched_at, payload
+            if self.stale_while_revalidate and age <= ttl + self.max_stale:
+                self._count(key, "stale_hits")
+                self._revalidate(key, loader, point)
+                return fetched_at, payload
+
+        self._count(key, "misses")
+        payload = loader()
+        fetched_at = time.time()
+        self.store(key, payload, fetched_at, point)
+        return fetched_at, payload
+
+    def lookup(self, key: tuple, kind: str) -> dict | None:
+        entry = self.lookup_entry(key, kind)
+        return None if entry is None else entry[1]
+
+    def lookup_entry(self, key: tuple, kind: str, point: tuple | None = None) -> tuple[float, dict] | None:
+        ttl = self.ttls.get(kind, self.ttls["current"])
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > ttl:
+            self._count(key, "misses")
+            return None
+        self._count_hit(key, entry, point)
+        return entry[1], entry[2]
+
+    def stats(self) -> dict:
+        # e.g. {"open-meteo/forecast": {"hits": 40, "grid_hits": 5, "stale_hits": 2, "misses": 10,
+        # "hit_rate": 0.82}}; "hits" are repeat requests for the same point within the TTL,
+        # "grid_hits" other points in the same forecast grid cell. Both kinds, and stale
+        # hits, are served, so they count towards the rate.
+        with self._lock:
+            counts = {endpoint: dict(values) for endpoint, values in self._counts.items()}
+        for values in counts.values():
+            served = values["hits"] + values["grid_hits"] + values["stale_hits"]
+            total = served + values["misses"]
+            values["hit_rate"] = served / total if total else 0.0
+        return counts
+
+    def store(
+        self, key: tuple, payload: dict, fetched_at: float | None = None, point: tuple | None = None
+    ) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._entries[key] = (time.monotonic(), fetched_at, payload, point)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _revalidate(self, key: tuple, loader: Callable[[], dict], point: tuple | None = None) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def task():
+            try:
+                self.store(key, loader(), point=point)
+            except WeatherAPIError:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SingleFlight:
+    # Concurrent callers asking for the same key share one in-flight call and
+    # receive the same result or exception.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[tuple, Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: tuple, fn: Callable[[], object]):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            try:
+                return future.result()
+            except RequestCancelled:
+                # The caller we piggybacked on was superseded; that is not our failure.
+                token = _current_cancel_token.get()
+                if token is not None and token.cancelled:
+                    raise
+                return self.do(key, fn)
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
 
 
 def _weather_code_to_text(code: int | None) -> str:
@@ -84,25 +811,191 @@ def _weather_code_to_text(code: int | None) -> str:
     return mapping.get(code, "Unknown")
 
 
+def _float_column(values: list, size: int) -> array:
+    column = array("d", (math.nan if value is None else value for value in values[:size]))
+    if len(column) < size:
+        column.extend([math.nan] * (size - len(column)))
+    return column
+
+
+def _code_column(values: list, size: int) -> array:
+    column = array("h", (-1 if value is None else value for value in values[:size]))
+    if len(column) < size:
+        column.extend([-1] * (size - len(column)))
+    return column
+
+
+class HourlyForecast:
+    # Columnar hourly series: every variable is a flat array indexed by the shared
+    # `time` axis (UTC epoch seconds, ascending). Missing values are NaN, or -1 for
+    # weather codes. window() bisects the time axis, so slicing a day out of a 16-day
+    # series is two binary searches and a few contiguous copies.
+    __slots__ = ("time", "temp", "precipitation_probability", "wind", "code", "utc_offset", "_converted")
+
+    def __init__(
+        self,
+        time: array | None = None,
+        temp: array | None = None,
+        precipitation_probability: array | None = None,
+        wind: array | None = None,
+        code: array | None = None,
+        utc_offset: int = 0,
+    ):
+        self.time = time if time is not None else array("q")
+        self.temp = temp if temp is not None else array("d")
+        self.precipitation_probability = (
+            precipitation_probability if precipitation_probability is not None else array("d")
+        )
+        self.wind = wind if wind is not None else array("d")
+        self.code = code if code is not None else array("h")
+        self.utc_offset = utc_offset
+        self._converted: tuple[str, "HourlyForecast"] | None = None
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def window(self, start: float | None = None, end: float | None = None) -> "HourlyForecast":
+        first = 0 if start is None else bisect.bisect_left(self.time, start)
+        last = len(self.time) if end is None else bisect.bisect_left(self.time, end)
+        return HourlyForecast(
+            self.time[first:last],
+            self.temp[first:last],
+            self.precipitation_probability[first:last],
+            self.wind[first:last],
+            self.code[first:last],
+            self.utc_offset,
+        )
+
+    def next_hours(self, hours: int, now: float | None = None) -> "HourlyForecast":
+        # Starts with the slot that covers `now`, which began up to one step earlier.
+        now = time.time() if now is None else now
+        step = self.time[1] - self.time[0] if len(self.time) > 1 else 3600
+        return self.window(now - step + 1, now + hours * 3600)
+
+    def converted(self, units: str) -> "HourlyForecast":
+        # Converting a column is a pass over it in Python, so a cached forecast converts
+        # once and every later caller in the same units gets that copy.
+        if units == CANONICAL_UNITS:
+            return self
+        converted = self._converted
+        if converted is None or converted[0] != units:
+            converted = self._converted = (
+                units,
+                HourlyForecast(
+                    self.time,
+                    convert_temperature_column(self.temp, units),
+                    self.precipitation_probability,
+                    convert_wind_column(self.wind, units),
+                    self.code,
+                    self.utc_offset,
+                ),
+            )
+        return converted[1]
+
+
+def _mps_to_kmh(value):
+    # OpenWeather's metric wind speeds are m/s; everything else here is km/h.
+    return None if value is None else value * 3.6
+
+
 class OpenWeatherClient:
-    def __init__(self, api_key: str | None = None):
+    name = "openweather"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        response_cache: ResponseCache | None = None,
+        policy: ProviderPolicy | None = None,
+    ):
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
         if not self.api_key:
             raise WeatherAPIError(
                 "Missing API key. Set OPENWEATHER_API_KEY environment variable."
             )
+        self.response_cache = response_cache
+        self.policy = policy
+
+    def _get(self, endpoint: str, params: dict, kind: str = "current") -> dict:
+        return self._get_entry(endpoint, params, kind)[1]
 
-    def _get(self, endpoint: str, params: dict) -> dict:
+    def _get_entry(self, endpoint: str, params: dict, kind: str = "current") -> tuple[float, dict]:
+        if self.response_cache is None:
+            payload = self._fetch(endpoint, params)
+            return time.time(), payload
+        key = ("openweather", endpoint, self._query_key(params))
+        return self.response_cache.fetch_entry(key, kind, lambda: self._fetch(endpoint, params))
+
+    def _fetch(self, endpoint: str, params: dict) -> dict:
         params = {**params, "appid": self.api_key}
-        status_code, payload = _http_json_request(f"{BASE_URL}/{endpoint}", params, timeout=10)
+        status_code, payload = _request(self.policy, f"{BASE_URL}/{endpoint}", params, timeout=10)
+        return self._check_status(status_code, payload)
+
+    @staticmethod
+    def _query_params(city: str) -> dict:
+        # "lat,lon" input goes to OpenWeather as coordinates rather than a name search.
+        coordinates = parse_coordinates(city)
+        if coordinates is not None:
+            return {"lat": coordinates[0], "lon": coordinates[1]}
+        return {"q": city}
+
+    @staticmethod
+    def _query_key(params: dict):
+        if "q" in params:
+            return normalize_city(params["q"])
+        return (params["lat"], params["lon"])
+
+    @staticmethod
+    def _check_status(status_code: int, payload: dict) -> dict:
         if status_code >= 400:
             message = payload.get("message", "Unknown API error.")
-            raise WeatherAPIError(f"OpenWeather error ({status_code}): {message}")
+            raise WeatherAPIError(
+                f"OpenWeather error ({status_code}): {message}",
+                status=status_code,
+                retryable=_is_retryable_status(status_code),
+            )
 
         return payload
 
     def current_weather(self, city: str, units: str = "imperial") -> Dict:
-        data = self._get("weather", {"q": city, "units": units})
+        data = self._get("weather", {**self._query_params(city), "units": CANONICAL_UNITS})
+        return convert_current(self._parse_current(city, data), units)
+
+    def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
+        data = self._get("forecast", {**self._query_params(city), "units": CANONICAL_UNITS}, kind="daily")
+        return convert_forecast(self._parse_daily(data), units)
+
+    def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        # "fetched_at" is when the current conditions were fetched, which can be well
+        # before now when a stale cache entry is served.
+        params = {**self._query_params(city), "units": CANONICAL_UNITS}
+        fetched_at, current = self._get_entry("weather", params)
+        daily = self._get("forecast", params, kind="daily")
+        return {
+            "current": convert_current(self._parse_current(city, current), units),
+            "forecast": convert_forecast(self._parse_daily(daily), units),
+            "fetched_at": fetched_at,
+        }
+
+    def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        # The free tier only has 3-hour steps; they come from the same cached payload
+        # as the five-day forecast.
+        data = self._get("forecast", {**self._query_params(city), "units": CANONICAL_UNITS}, kind="daily")
+        return self._parse_hourly(data).converted(units)
+
+    def forecast_many(self, cities: List[str], units: str = "imperial") -> Dict[str, Dict | WeatherAPIError]:
+        # OpenWeather has no multi-location endpoint, so this is one bundle per city.
+        results: Dict[str, Dict | WeatherAPIError] = {}
+        for city in cities:
+            try:
+                results[city] = self.fetch_bundle(city, units)
+            except WeatherAPIError as exc:
+                if not _city_error(exc):
+                    raise
+                results[city] = exc
+        return results
+
+    @staticmethod
+    def _parse_current(city: str, data: Dict) -> Dict:
         weather = data.get("weather", [{}])
         main = data.get("main", {})
         wind = data.get("wind", {})
@@ -114,13 +1007,27 @@ class OpenWeatherClient:
             "temp_min": main.get("temp_min"),
             "temp_max": main.get("temp_max"),
             "humidity": main.get("humidity"),
-            "wind": wind.get("speed"),
+            "wind": _mps_to_kmh(wind.get("speed")),
             "description": weather[0].get("description", "N/A").title(),
+            "code": weather[0].get("id"),
         }
 
-    def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
-        data = self._get("forecast", {"q": city, "units": units})
+    @staticmethod
+    def _parse_hourly(data: Dict) -> HourlyForecast:
+        items = data.get("list", [])
+        size = len(items)
+        pops = [item.get("pop") for item in items]
+        return HourlyForecast(
+            array("q", (item.get("dt", 0) for item in items)),
+            _float_column([item.get("main", {}).get("temp") for item in items], size),
+            _float_column([None if pop is None else pop * 100 for pop in pops], size),
+            _float_column([_mps_to_kmh(item.get("wind", {}).get("speed")) for item in items], size),
+            _code_column([(item.get("weather") or [{}])[0].get("id") for item in items], size),
+            data.get("city", {}).get("timezone", 0),
+        )
 
+    @staticmethod
+    def _parse_daily(data: Dict) -> List[Dict]:
         daily = []
         seen_dates = set()
 
@@ -154,51 +1061,321 @@ class OpenWeatherClient:
 
 
 class OpenMeteoClient:
+    name = "open-meteo"
+
+    def __init__(
+        self,
+        geocode_cache: GeocodeCache | None = None,
+        language: str = "en",
+        response_cache: ResponseCache | None = None,
+        policy: ProviderPolicy | None = None,
+        gazetteer: Gazetteer | None = None,
+        grid: float = FORECAST_GRID_DEGREES,
+    ):
+        self.geocode_cache = geocode_cache
+        self.language = language
+        self.response_cache = response_cache
+        self.policy = policy
+        self.gazetteer = gazetteer
+        self.grid = grid
+        self._suggested: OrderedDict[str, Dict] = OrderedDict()
+        self._suggested_lock = threading.Lock()
+
+    def _cached_location(self, city: str) -> Dict | None:
+        # Coordinates need no geocoding at all; the gazetteer only names them.
+        location = resolve_coordinates(city, self.gazetteer)
+        if location is not None:
+            return location
+        with self._suggested_lock:
+            suggested = self._suggested.get(normalize_city(city))
+        if suggested is not None:
+            # Picked from the suggestions; only now is it worth keeping.
+            if self.geocode_cache is not None:
+                self.geocode_cache.put(city, suggested, self.language)
+            return suggested
+        # The offline gazetteer answers first; its names are GeoNames' English ones, so
+        # other languages keep going to the geocoding API.
+        if self.gazetteer is not None and self.language == "en":
+            location = self.gazetteer.lookup(city)
+            if location is not None:
+                return location
+        if self.geocode_cache is None:
+            return None
+        cached = self.geocode_cache.get(city, self.language)
+        if cached is NOT_FOUND:
+            raise WeatherAPIError(f"City not found: {city}")
+        return cached
+
     def _geocode(self, city: str) -> Dict:
-        status_code, payload = _http_json_request(
+        cached = self._cached_location(city)
+        if cached is not None:
+            return cached
+
+        status_code, payload = _request(
+            self.policy,
             OPEN_METEO_GEOCODE_URL,
-            {"name": city, "count": 1, "language": "en", "format": "json"},
+            {"name": city, "count": 1, "language": self.language, "format": "json"},
             timeout=10,
         )
+        return self._store_location(city, status_code, payload)
+
+    def _store_location(self, city: str, status_code: int, payload: dict) -> Dict:
         if status_code >= 400:
-            raise WeatherAPIError(f"Open-Meteo geocoding failed (HTTP {status_code}).")
+            raise WeatherAPIError(
+                f"Open-Meteo geocoding failed (HTTP {status_code}).",
+                status=status_code,
+                retryable=_is_retryable_status(status_code),
+            )
 
         results = payload.get("results") or []
         if not results:
+            if self.geocode_cache is not None:
+                self.geocode_cache.put(city, None, self.language)
             raise WeatherAPIError(f"City not found: {city}")
 
         top = results[0]
-        return {
+        location = {
             "name": top.get("name", city),
             "country": top.get("country", ""),
             "latitude": top.get("latitude"),
             "longitude": top.get("longitude"),
         }
+        if self.geocode_cache is not None:
+            self.geocode_cache.put(city, location, self.language)
+        return location
+
+    def search_cities(self, text: str, count: int = 8) -> List[Dict]:
+        # Geocoder matches for a partial name, for autocomplete. Each one is remembered
+        # under its "Name, Country" label so picking it resolves to that exact place
+        # without another request.
+        status_code, payload = _request(
+            self.policy,
+            OPEN_METEO_GEOCODE_URL,
+            {"name": text, "count": count, "language": self.language, "format": "json"},
+            timeout=10,
+        )
+        return self._store_suggestions(status_code, payload)
+
+    def _store_suggestions(self, status_code: int, payload: dict) -> List[Dict]:
+        if status_code >= 400:
+            raise WeatherAPIError(
+                f"Open-Meteo geocoding failed (HTTP {status_code}).",
+                status=status_code,
+                retryable=_is_retryable_status(status_code),
+            )
+        locations = []
+        for result in payload.get("results") or []:
+            if result.get("latitude") is None or result.get("longitude") is None:
+                continue
+            location = {
+                "name": result.get("name", ""),
+                "country": result.get("country", ""),
+                "latitude": result["latitude"],
+                "longitude": result["longitude"],
+            }
+            with self._suggested_lock:
+                self._suggested[normalize_city(location_label(location))] = location
+                while len(self._suggested) > SUGGESTED_LOCATIONS:
+                    self._suggested.popitem(last=False)
+            locations.append(location)
+        return locations
+
+    def _grid_point(self, latitude: float, longitude: float) -> tuple[float, float]:
+        # Centre of the grid cell the point falls in, for cache keys only; requests are
+        # always made for the exact point. The point itself with no grid.
+        if self.grid <= 0:
+            return latitude, longitude
+        cell_latitude = (math.floor(latitude / self.grid) + 0.5) * self.grid
+        cell_longitude = (math.floor(longitude / self.grid) + 0.5) * self.grid
+        return round(max(-90.0, min(90.0, cell_latitude)), 6), round(max(-180.0, min(180.0, cell_longitude)), 6)
+
+    def _forecast(self, latitude: float, longitude: float, kind: str = "current") -> Dict:
+        return self._forecast_entry(latitude, longitude, kind)[1]
+
+    def _forecast_entry(self, latitude: float, longitude: float, kind: str = "current") -> tuple[float, Dict]:
+        if self.response_cache is None:
+            payload = self._fetch_forecast(latitude, longitude)
+            return time.time(), payload
+        key = self._forecast_key(latitude, longitude)
+        return self.response_cache.fetch_entry(
+            key, kind, lambda: self._fetch_forecast(latitude, longitude), (latitude, longitude)
+        )
+
+    def _fetch_forecast(self, latitude: float, longitude: float) -> Dict:
+        params = self._forecast_params(latitude, longitude)
+        status_code, payload = _request(self.policy, OPEN_METEO_FORECAST_URL, params, timeout=10)
+        return self._check_forecast_status(status_code, payload)
 
-    def _forecast(self, latitude: float, longitude: float, units: str) -> Dict:
-        temp_unit = "fahrenheit" if units == "imperial" else "celsius"
-        wind_unit = "mph" if units == "imperial" else "kmh"
+    def _forecast_key(self, latitude: float, longitude: float) -> tuple:
+        # Takes the exact point; it is snapped here and only here.
+        latitude, longitude = self._grid_point(latitude, longitude)
+        return ("open-meteo", "forecast", round(latitude, 4), round(longitude, 4))
 
-        params = {
+    @staticmethod
+    def _forecast_params(latitude: float | str, longitude: float | str) -> dict:
+        # Open-Meteo defaults to celsius and km/h, i.e. CANONICAL_UNITS.
+        return {
             "latitude": latitude,
             "longitude": longitude,
             "timezone": "auto",
-            "temperature_unit": temp_unit,
-            "wind_speed_unit": wind_unit,
             "current": "temperature_2m,relative_humidity_2m,apparent_temperature,wind_speed_10m,weather_code",
             "daily": "temperature_2m_max,temperature_2m_min,weather_code",
             "forecast_days": 5,
         }
 
-        status_code, payload = _http_json_request(OPEN_METEO_FORECAST_URL, params, timeout=10)
+    @staticmethod
+    def _check_forecast_status(status_code: int, payload: dict) -> dict:
         if status_code >= 400:
-            raise WeatherAPIError(f"Open-Meteo forecast failed (HTTP {status_code}).")
+            raise WeatherAPIError(
+                f"Open-Meteo forecast failed (HTTP {status_code}).",
+                status=status_code,
+                retryable=_is_retryable_status(status_code),
+            )
         return payload
 
     def current_weather(self, city: str, units: str = "imperial") -> Dict:
         location = self._geocode(city)
-        data = self._forecast(location["latitude"], location["longitude"], units)
+        data = self._forecast(location["latitude"], location["longitude"])
+        return convert_current(self._parse_current(location, data), units)
+
+    def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
+        location = self._geocode(city)
+        data = self._forecast(location["latitude"], location["longitude"], kind="daily")
+        return convert_forecast(self._parse_daily(data), units)
+
+    def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        # The forecast payload already carries both the current and daily blocks.
+        location = self._geocode(city)
+        fetched_at, data = self._forecast_entry(location["latitude"], location["longitude"])
+        return convert_bundle(self._parse_bundle(location, data, fetched_at), units)
+
+    def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        # Hourly data is its own request so the bundle fetch stays small; the cache keeps
+        # the parsed columns rather than the JSON lists.
+        location = self._geocode(city)
+        latitude, longitude = location["latitude"], location["longitude"]
+        if self.response_cache is None:
+            return self._fetch_hourly(latitude, longitude).converted(units)
+        key = self._hourly_key(latitude, longitude)
+        _, forecast = self.response_cache.fetch_entry(
+            key, "current", lambda: self._fetch_hourly(latitude, longitude), (latitude, longitude)
+        )
+        return forecast.converted(units)
+
+    def _fetch_hourly(self, latitude: float, longitude: float) -> HourlyForecast:
+        params = self._hourly_params(latitude, longitude)
+        status_code, payload = _request(self.policy, OPEN_METEO_FORECAST_URL, params, timeout=10)
+        return self._parse_hourly(self._check_forecast_status(status_code, payload))
+
+    def _hourly_key(self, latitude: float, longitude: float) -> tuple:
+        latitude, longitude = self._grid_point(latitude, longitude)
+        return ("open-meteo", "hourly", round(latitude, 4), round(longitude, 4))
+
+    @staticmethod
+    def _hourly_params(latitude: float, longitude: float) -> dict:
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": "auto",
+            "timeformat": "unixtime",
+            "hourly": "temperature_2m,precipitation_probability,wind_speed_10m,weather_code",
+            "forecast_days": HOURLY_FORECAST_DAYS,
+        }
+
+    def forecast_many(self, cities: List[str], units: str = "imperial") -> Dict[str, Dict | WeatherAPIError]:
+        results: Dict[str, Dict | WeatherAPIError] = {}
+        locations = {}
+        for city in cities:
+            try:
+                locations[city] = self._geocode(city)
+            except WeatherAPIError as exc:
+                if not _city_error(exc):
+                    raise
+                results[city] = exc
+
+        payloads, pending = self._plan_batches(locations.values())
+        for chunk in pending:
+            try:
+                batch = self._fetch_forecast_batch([coords for _, coords in chunk])
+            except WeatherAPIError as exc:
+                if not _city_error(exc):
+                    raise
+                batch = exc
+            self._apply_batch(payloads, chunk, batch)
+
+        return self._assemble_many(cities, results, locations, payloads, units)
+
+    def _fetch_forecast_batch(self, coords: List[tuple]) -> List[Dict]:
+        params = self._batch_params(coords)
+        status_code, payload = _request(self.policy, OPEN_METEO_FORECAST_URL, params, timeout=20)
+        return self._split_batch(coords, self._check_forecast_status(status_code, payload))
 
+    def _plan_batches(self, locations) -> tuple[dict, List[List[tuple]]]:
+        # Cities in the same grid cell, or whose forecast is still cached, do not take a
+        # slot in the multi-location requests.
+        payloads: dict = {}
+        pending: dict = {}
+        for location in locations:
+            point = (location["latitude"], location["longitude"])
+            key = self._forecast_key(*point)
+            if key in payloads or key in pending:
+                continue
+            cached = self.response_cache.lookup_entry(key, "current", point) if self.response_cache else None
+            if cached is not None:
+                payloads[key] = cached
+            else:
+                pending[key] = point
+
+        items = list(pending.items())
+        chunks = [items[i : i + OPEN_METEO_BATCH_SIZE] for i in range(0, len(items), OPEN_METEO_BATCH_SIZE)]
+        return payloads, chunks
+
+    def _batch_params(self, coords: List[tuple]) -> dict:
+        return self._forecast_params(
+            ",".join(str(lat) for lat, _ in coords),
+            ",".join(str(lon) for _, lon in coords),
+        )
+
+    @staticmethod
+    def _split_batch(coords: List[tuple], payload) -> List[Dict]:
+        # Open-Meteo answers a single location with an object and several with a list.
+        batch = payload if isinstance(payload, list) else [payload]
+        if len(batch) != len(coords):
+            raise WeatherAPIError("Open-Meteo returned an unexpected number of locations.")
+        return batch
+
+    def _apply_batch(self, payloads: dict, chunk: List[tuple], batch: List[Dict] | WeatherAPIError) -> None:
+        # payloads maps a forecast key to (fetched_at, payload) or the batch's error.
+        fetched_at = time.time()
+        for i, (key, point) in enumerate(chunk):
+            if isinstance(batch, WeatherAPIError):
+                payloads[key] = batch
+                continue
+            payloads[key] = (fetched_at, batch[i])
+            if self.response_cache is not None:
+                self.response_cache.store(key, batch[i], fetched_at, point)
+
+    def _assemble_many(
+        self, cities: List[str], results: dict, locations: dict, payloads: dict, units: str
+    ) -> Dict[str, Dict | WeatherAPIError]:
+        for city, location in locations.items():
+            entry = payloads[self._forecast_key(location["latitude"], location["longitude"])]
+            if isinstance(entry, WeatherAPIError):
+                results[city] = entry
+            else:
+                results[city] = convert_bundle(self._parse_bundle(location, entry[1], entry[0]), units)
+        return {city: results[city] for city in cities}
+
+    @classmethod
+    def _parse_bundle(cls, location: Dict, data: Dict, fetched_at: float) -> Dict:
+        return {
+            "current": cls._parse_current(location, data),
+            "forecast": cls._parse_daily(data),
+            "fetched_at": fetched_at,
+        }
+
+    @staticmethod
+    def _parse_current(location: Dict, data: Dict) -> Dict:
         current = data.get("current", {})
         daily = data.get("daily", {})
         min_list = daily.get("temperature_2m_min", [])
@@ -217,11 +1394,11 @@ class OpenMeteoClient:
             "humidity": current.get("relative_humidity_2m"),
             "wind": current.get("wind_speed_10m"),
             "description": _weather_code_to_text(current.get("weather_code")),
+            "code": current.get("weather_code"),
         }
 
-    def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
-        location = self._geocode(city)
-        data = self._forecast(location["latitude"], location["longitude"], units)
+    @staticmethod
+    def _parse_daily(data: Dict) -> List[Dict]:
         daily = data.get("daily", {})
 
         dates = daily.get("time", [])
@@ -250,33 +1427,771 @@ class OpenMeteoClient:
 
         return out
 
+    @staticmethod
+    def _parse_hourly(data: Dict) -> HourlyForecast:
+        hourly = data.get("hourly", {})
+        times = array("q", hourly.get("time", []))
+        size = len(times)
+        return HourlyForecast(
+            times,
+            _float_column(hourly.get("temperature_2m", []), size),
+            _float_column(hourly.get("precipitation_probability", []), size),
+            _float_column(hourly.get("wind_speed_10m", []), size),
+            _code_column(hourly.get("weather_code", []), size),
+            data.get("utc_offset_seconds", 0),
+        )
+
+
+def _convert_result(method_name: str, result, units: str):
+    if units == CANONICAL_UNITS:
+        return result
+    if method_name == "current_weather":
+        return convert_current(result, units)
+    if method_name == "five_day_forecast":
+        return convert_forecast(result, units)
+    if method_name == "hourly_forecast":
+        return result.converted(units)
+    if method_name == "forecast_many":
+        return {
+            city: bundle if isinstance(bundle, WeatherAPIError) else convert_bundle(bundle, units)
+            for city, bundle in result.items()
+        }
+    return convert_bundle(result, units)
+
 
 class WeatherClient:
-    def __init__(self, provider: str | None = None, api_key: str | None = None):
+    def __init__(
+        self,
+        provider: str | None = None,
+        api_key: str | None = None,
+        geocode_cache: GeocodeCache | None = None,
+        stale_while_revalidate: bool = False,
+        hedge: bool | None = None,
+        hedge_percentile: float = 90.0,
+        gazetteer: Gazetteer | None = None,
+        forecast_grid: float | None = None,
+    ):
         self.provider = (provider or os.getenv("WEATHER_PROVIDER") or "auto").lower()
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
+        self.geocode_cache = geocode_cache if geocode_cache is not None else GeocodeCache()
+        self.gazetteer = gazetteer if gazetteer is not None else default_gazetteer()
+        if forecast_grid is None:
+            forecast_grid = float(os.getenv("WEATHER_FORECAST_GRID") or FORECAST_GRID_DEGREES)
+        self.forecast_grid = forecast_grid
+        self.response_cache = ResponseCache(stale_while_revalidate=stale_while_revalidate)
+        self.single_flight = SingleFlight()
+        self.policies = _default_policies()
+        self._providers: dict = {}
+
+        if hedge is None:
+            hedge = os.getenv("WEATHER_HEDGE_REQUESTS", "").strip().lower() in {"1", "true", "yes"}
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_stats = {"hedged": 0, "alternate_wins": 0}
+        self.latency: dict[tuple, LatencyTracker] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
 
         if self.provider == "open-meteo":
-            self.client = OpenMeteoClient()
-        elif self.provider == "openweather":
-            self.client = OpenWeatherClient(self.api_key)
+            self.client = self._provider("open-meteo")
+        elif self.provider == "openweather" or self.api_key:
+            self.client = self._provider("openweather")
         else:
-            self.client = OpenWeatherClient(self.api_key) if self.api_key else OpenMeteoClient()
+            self.client = self._provider("open-meteo")
+
+    def _provider(self, name: str):
+        client = self._providers.get(name)
+        if client is None:
+            if name == "openweather":
+                client = OpenWeatherClient(self.api_key, self.response_cache, self.policies[name])
+            else:
+                client = OpenMeteoClient(
+                    self.geocode_cache,
+                    response_cache=self.response_cache,
+                    policy=self.policies[name],
+                    gazetteer=self.gazetteer,
+                    grid=self.forecast_grid,
+                )
+            self._providers[name] = client
+        return client
+
+    def _alternate(self, client):
+        if isinstance(client, OpenWeatherClient):
+            return self._provider("open-meteo")
+        if self.api_key:
+            return self._provider("openweather")
+        return None
 
     def _call_with_fallback(self, method_name: str, city: str, units: str):
-        method = getattr(self.client, method_name)
+        client = self.client
+        alternate = self._alternate(client)
+        if self.hedge and alternate is not None:
+            return self._hedged(client, alternate, method_name, city, units)
         try:
-            return method(city, units)
+            return self._coalesced(client, method_name, city, units)
         except WeatherAPIError as exc:
-            is_auth_error = "OpenWeather error (401)" in str(exc)
-            if isinstance(self.client, OpenWeatherClient) and is_auth_error:
-                self.client = OpenMeteoClient()
-                method = getattr(self.client, method_name)
-                return method(city, units)
-            raise
+            return self._recover(client, alternate, exc, method_name, city, units)
+
+    def _recover(self, client, alternate, exc: WeatherAPIError, method_name: str, city, units: str):
+        if isinstance(client, OpenWeatherClient) and exc.status == 401:
+            # A rejected key will not start working; stay on Open-Meteo from now on.
+            if self.client is client:
+                self.client = self._provider("open-meteo")
+            return self._coalesced(self.client, method_name, city, units)
+        if alternate is not None and _should_fail_over(exc):
+            return self._coalesced(alternate, method_name, city, units)
+        raise exc
+
+    def _hedged(self, client, alternate, method_name: str, city, units: str):
+        # Give the primary provider until its observed p90 (or so) latency, then race the
+        # same query against the alternate and keep whichever valid answer lands first.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="weather-hedge")
+        tracker = self._tracker(client, method_name)
+        delay = tracker.percentile(self.hedge_percentile, HEDGE_DEFAULT_DELAY)
+
+        # Each leg runs under its own token so the loser can be aborted (its socket shut
+        # down) without touching the winner; cancelling the caller's token aborts both.
+        outer = _current_cancel_token.get()
+        tokens = {}
+        handles = []
+
+        def submit(provider):
+            token = CancelToken()
+            if outer is not None:
+                handles.append(outer.on_cancel(token.cancel))
+            future = self._executor.submit(
+                contextvars.copy_context().run, self._leg, token, provider, method_name, city, units
+            )
+            tokens[future] = token
+            return future
+
+        try:
+            primary = submit(client)
+            done, _ = wait([primary], timeout=delay)
+            if done:
+                try:
+                    return primary.result()
+                except WeatherAPIError as exc:
+                    return self._recover(client, alternate, exc, method_name, city, units)
+
+            with self._lock:
+                self.hedge_stats["hedged"] += 1
+            secondary = submit(alternate)
+            pending = {primary, secondary}
+            errors = {}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except WeatherAPIError as exc:
+                        errors[future] = exc
+                        continue
+                    for other in pending:
+                        other.cancel()
+                        tokens[other].cancel()
+                    if future is secondary:
+                        with self._lock:
+                            self.hedge_stats["alternate_wins"] += 1
+                    return result
+        finally:
+            for handle in handles:
+                outer.remove(handle)
+
+        if isinstance(client, OpenWeatherClient) and errors[primary].status == 401 and self.client is client:
+            self.client = self._provider("open-meteo")
+        raise errors[secondary]
+
+    def _leg(self, token: CancelToken, client, method_name: str, city, units: str):
+        with token.bound():
+            return self._coalesced(client, method_name, city, units)
+
+    def _tracker(self, client, method_name: str) -> LatencyTracker:
+        return self.latency.setdefault((client.name, method_name), LatencyTracker())
+
+    def transfer_stats(self) -> dict:
+        # Shared by every client in the process, like the connection pool itself.
+        return _POOL.stats()
+
+    def cache_stats(self) -> dict:
+        # Forecast hit rates per endpoint; compare them across WEATHER_FORECAST_GRID values.
+        return self.response_cache.stats()
+
+    def _coalesced(self, client, method_name: str, city, units: str):
+        # Batch calls are keyed by their exact city list because results are keyed by it.
+        # Providers are always asked for CANONICAL_UNITS, so an imperial and a metric
+        # caller share one request and only the local conversion differs.
+        query = normalize_city(city) if isinstance(city, str) else tuple(city)
+        key = (client.name, method_name, query)
+        tracker = self._tracker(client, method_name)
+
+        def call():
+            started = time.monotonic()
+            result = getattr(client, method_name)(city, CANONICAL_UNITS)
+            tracker.record(time.monotonic() - started)
+            return result
+
+        return _convert_result(method_name, self.single_flight.do(key, call), units)
 
     def current_weather(self, city: str, units: str = "imperial") -> Dict:
         return self._call_with_fallback("current_weather", city, units)
 
     def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
         return self._call_with_fallback("five_day_forecast", city, units)
+
+    def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        return self._call_with_fallback("fetch_bundle", city, units)
+
+    def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        return self._call_with_fallback("hourly_forecast", city, units)
+
+    def forecast_many(self, cities: List[str], units: str = "imperial") -> Dict[str, Dict | WeatherAPIError]:
+        return self._call_with_fallback("forecast_many", cities, units)
+
+    def search_cities(self, text: str, count: int = 8) -> List[Dict]:
+        # Always Open-Meteo: OpenWeather has no keyless name search.
+        client = self._provider("open-meteo")
+        key = (client.name, "search_cities", normalize_city(text), count)
+        return self.single_flight.do(key, lambda: client.search_cities(text, count))
+
+
+class _AsyncConnectionPool:
+    # asyncio counterpart of _ConnectionPool. Streams belong to the event loop that opened
+    # them, so each AsyncWeatherClient owns its own pool.
+    def __init__(self, max_per_host: int = 4, idle_timeout: float = 30.0):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle: dict[tuple, list[tuple[asyncio.StreamReader, asyncio.StreamWriter, float]]] = {}
+        self._slots: dict[tuple, asyncio.Semaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        self.transfer = _TransferStats()
+
+    async def request(self, url: str, headers: dict, timeout: float) -> tuple[int, bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        head = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        message = (head + "\r\n").encode("latin-1")
+
+        slot = self._slots.setdefault(key, asyncio.Semaphore(self.max_per_host))
+        async with slot:
+            return await asyncio.wait_for(self._request(key, message), timeout)
+
+    async def _request(self, key: tuple, message: bytes) -> tuple[int, bytes]:
+        reader, writer, reused = await self._checkout(key)
+        try:
+            status, body, will_close = await self._send(reader, writer, message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused:
+                raise
+            # Same stale keep-alive retry as the blocking pool.
+            self._drop_idle(key)
+            reader, writer, _ = await self._checkout(key)
+            status, body, will_close = await self._send(reader, writer, message)
+
+        if will_close:
+            writer.close()
+        else:
+            self._idle.setdefault(key, []).append((reader, writer, time.monotonic()))
+        self.transfer.record(body)
+        return status, body.content
+
+    async def _checkout(self, key: tuple) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        now = time.monotonic()
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer, last_used = idle.pop()
+            if now - last_used < self.idle_timeout and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        ssl_context = self._ssl_context if scheme == "https" else None
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return reader, writer, False
+
+    def _drop_idle(self, key: tuple) -> None:
+        for _, writer, _ in self._idle.pop(key, []):
+            writer.close()
+
+    @staticmethod
+    async def _send(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter, message: bytes
+    ) -> tuple[int, _BodyDecoder, bool]:
+        try:
+            writer.write(message)
+            await writer.drain()
+            return await _read_http_response(reader)
+        except BaseException:
+            writer.close()
+            raise
+
+    def stats(self) -> dict:
+        return self.transfer.snapshot()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer, _ in conns:
+                writer.close()
+
+
+async def _read_http_response(reader: asyncio.StreamReader) -> tuple[int, _BodyDecoder, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Server closed the connection")
+    try:
+        status = int(status_line.split(b" ", 2)[1])
+    except (IndexError, ValueError) as exc:
+        raise http.client.BadStatusLine(status_line.decode("latin-1", "replace")) from exc
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    will_close = headers.get("connection", "").lower() == "close"
+    body = _BodyDecoder(headers.get("content-encoding"))
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            while size > 0:
+                chunk = await reader.readexactly(min(size, READ_CHUNK_BYTES))
+                body.feed(chunk)
+                size -= len(chunk)
+            await reader.readexactly(2)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            chunk = await reader.readexactly(min(remaining, READ_CHUNK_BYTES))
+            body.feed(chunk)
+            remaining -= len(chunk)
+    else:
+        while chunk := await reader.read(READ_CHUNK_BYTES):
+            body.feed(chunk)
+        will_close = True
+
+    body.finish()
+    return status, body, will_close
+
+
+async def _async_request(
+    policy: ProviderPolicy | None, pool: _AsyncConnectionPool, url: str, params: dict, timeout: int = 10
+) -> tuple[int, dict]:
+    if policy is None:
+        return await _async_http_json_request(pool, url, params, timeout)
+    return await policy.call_async(lambda: _async_http_json_request(pool, url, params, timeout))
+
+
+async def _async_http_json_request(
+    pool: _AsyncConnectionPool, url: str, params: dict, timeout: int = 10
+) -> tuple[int, dict]:
+    query = urlencode(params)
+    full_url = f"{url}?{query}" if query else url
+    headers = {
+        "User-Agent": "WeatherDashboard/1.0",
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+    try:
+        status, raw = await pool.request(full_url, headers, timeout)
+    except (OSError, EOFError, http.client.HTTPException) as exc:
+        raise WeatherAPIError(f"Network/API error: {exc or type(exc).__name__}", retryable=True) from exc
+
+    return status, _decode_json(raw)
+
+
+class AsyncOpenWeatherClient(OpenWeatherClient):
+    def __init__(
+        self,
+        pool: _AsyncConnectionPool,
+        api_key: str | None = None,
+        response_cache: ResponseCache | None = None,
+        policy: ProviderPolicy | None = None,
+    ):
+        super().__init__(api_key, response_cache, policy)
+        self.pool = pool
+
+    async def _get(self, endpoint: str, params: dict, kind: str = "current") -> dict:
+        return (await self._get_entry(endpoint, params, kind))[1]
+
+    async def _get_entry(self, endpoint: str, params: dict, kind: str = "current") -> tuple[float, dict]:
+        key = ("openweather", endpoint, self._query_key(params))
+        if self.response_cache is not None:
+            cached = self.response_cache.lookup_entry(key, kind)
+            if cached is not None:
+                return cached
+
+        status_code, payload = await _async_request(
+            self.policy, self.pool, f"{BASE_URL}/{endpoint}", {**params, "appid": self.api_key}, timeout=10
+        )
+        payload = self._check_status(status_code, payload)
+        fetched_at = time.time()
+        if self.response_cache is not None:
+            self.response_cache.store(key, payload, fetched_at)
+        return fetched_at, payload
+
+    async def current_weather(self, city: str, units: str = "imperial") -> Dict:
+        data = await self._get("weather", {**self._query_params(city), "units": CANONICAL_UNITS})
+        return convert_current(self._parse_current(city, data), units)
+
+    async def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
+        data = await self._get("forecast", {**self._query_params(city), "units": CANONICAL_UNITS}, kind="daily")
+        return convert_forecast(self._parse_daily(data), units)
+
+    async def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        # OpenWeather serves current and forecast from separate endpoints; fetch both at once.
+        params = {**self._query_params(city), "units": CANONICAL_UNITS}
+        (fetched_at, current), daily = await asyncio.gather(
+            self._get_entry("weather", params),
+            self._get("forecast", params, kind="daily"),
+        )
+        return {
+            "current": convert_current(self._parse_current(city, current), units),
+            "forecast": convert_forecast(self._parse_daily(daily), units),
+            "fetched_at": fetched_at,
+        }
+
+    async def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        data = await self._get("forecast", {**self._query_params(city), "units": CANONICAL_UNITS}, kind="daily")
+        return self._parse_hourly(data).converted(units)
+
+    async def forecast_many(
+        self, cities: List[str], units: str = "imperial"
+    ) -> Dict[str, Dict | WeatherAPIError]:
+        results = await asyncio.gather(
+            *(self.fetch_bundle(city, units) for city in cities), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not _city_error(result):
+                raise result
+        return dict(zip(cities, results))
+
+
+class AsyncOpenMeteoClient(OpenMeteoClient):
+    def __init__(
+        self,
+        pool: _AsyncConnectionPool,
+        geocode_cache: GeocodeCache | None = None,
+        language: str = "en",
+        response_cache: ResponseCache | None = None,
+        policy: ProviderPolicy | None = None,
+        gazetteer: Gazetteer | None = None,
+        grid: float = FORECAST_GRID_DEGREES,
+    ):
+        super().__init__(geocode_cache, language, response_cache, policy, gazetteer, grid)
+        self.pool = pool
+
+    async def _geocode(self, city: str) -> Dict:
+        # The geocode cache is SQLite and commits synchronously, so it is read and written
+        # on a worker thread rather than on the event loop.
+        cached = await asyncio.to_thread(self._cached_location, city)
+        if cached is not None:
+            return cached
+
+        status_code, payload = await _async_request(
+            self.policy,
+            self.pool,
+            OPEN_METEO_GEOCODE_URL,
+            {"name": city, "count": 1, "language": self.language, "format": "json"},
+            timeout=10,
+        )
+        return await asyncio.to_thread(self._store_location, city, status_code, payload)
+
+    async def _forecast(self, latitude: float, longitude: float, kind: str = "current") -> Dict:
+        return (await self._forecast_entry(latitude, longitude, kind))[1]
+
+    async def _forecast_entry(self, latitude: float, longitude: float, kind: str = "current") -> tuple[float, Dict]:
+        key = self._forecast_key(latitude, longitude)
+        if self.response_cache is not None:
+            cached = self.response_cache.lookup_entry(key, kind, (latitude, longitude))
+            if cached is not None:
+                return cached
+
+        params = self._forecast_params(latitude, longitude)
+        status_code, payload = await _async_request(
+            self.policy, self.pool, OPEN_METEO_FORECAST_URL, params, timeout=10
+        )
+        payload = self._check_forecast_status(status_code, payload)
+        fetched_at = time.time()
+        if self.response_cache is not None:
+            self.response_cache.store(key, payload, fetched_at, (latitude, longitude))
+        return fetched_at, payload
+
+    async def current_weather(self, city: str, units: str = "imperial") -> Dict:
+        location = await self._geocode(city)
+        data = await self._forecast(location["latitude"], location["longitude"])
+        return convert_current(self._parse_current(location, data), units)
+
+    async def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
+        location = await self._geocode(city)
+        data = await self._forecast(location["latitude"], location["longitude"], kind="daily")
+        return convert_forecast(self._parse_daily(data), units)
+
+    async def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        location = await self._geocode(city)
+        fetched_at, data = await self._forecast_entry(location["latitude"], location["longitude"])
+        return convert_bundle(self._parse_bundle(location, data, fetched_at), units)
+
+    async def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        location = await self._geocode(city)
+        latitude, longitude = location["latitude"], location["longitude"]
+        key = self._hourly_key(latitude, longitude)
+        if self.response_cache is not None:
+            cached = self.response_cache.lookup_entry(key, "current", (latitude, longitude))
+            if cached is not None:
+                return cached[1].converted(units)
+
+        params = self._hourly_params(latitude, longitude)
+        status_code, payload = await _async_request(
+            self.policy, self.pool, OPEN_METEO_FORECAST_URL, params, timeout=10
+        )
+        forecast = self._parse_hourly(self._check_forecast_status(status_code, payload))
+        if self.response_cache is not None:
+            self.response_cache.store(key, forecast, point=(latitude, longitude))
+        return forecast.converted(units)
+
+    async def forecast_many(
+        self, cities: List[str], units: str = "imperial"
+    ) -> Dict[str, Dict | WeatherAPIError]:
+        geocoded = await asyncio.gather(*(self._geocode(city) for city in cities), return_exceptions=True)
+        results: Dict[str, Dict | WeatherAPIError] = {}
+        locations = {}
+        for city, location in zip(cities, geocoded):
+            if _city_error(location):
+                results[city] = location
+            elif isinstance(location, BaseException):
+                raise location
+            else:
+                locations[city] = location
+
+        payloads, pending = self._plan_batches(locations.values())
+        batches = await asyncio.gather(
+            *(self._fetch_forecast_batch([coords for _, coords in chunk]) for chunk in pending),
+            return_exceptions=True,
+        )
+        for chunk, batch in zip(pending, batches):
+            if isinstance(batch, BaseException) and not _city_error(batch):
+                raise batch
+            self._apply_batch(payloads, chunk, batch)
+
+        return self._assemble_many(cities, results, locations, payloads, units)
+
+    async def _fetch_forecast_batch(self, coords: List[tuple]) -> List[Dict]:
+        params = self._batch_params(coords)
+        status_code, payload = await _async_request(
+            self.policy, self.pool, OPEN_METEO_FORECAST_URL, params, timeout=20
+        )
+        return self._split_batch(coords, self._check_forecast_status(status_code, payload))
+
+
+class AsyncWeatherClient:
+    def __init__(
+        self,
+        provider: str | None = None,
+        api_key: str | None = None,
+        geocode_cache: GeocodeCache | None = None,
+        max_per_host: int | None = None,
+        hedge: bool | None = None,
+        hedge_percentile: float = 90.0,
+        gazetteer: Gazetteer | None = None,
+        forecast_grid: float | None = None,
+    ):
+        self.provider = (provider or os.getenv("WEATHER_PROVIDER") or "auto").lower()
+        self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
+        self.geocode_cache = geocode_cache if geocode_cache is not None else GeocodeCache()
+        self.gazetteer = gazetteer if gazetteer is not None else default_gazetteer()
+        if forecast_grid is None:
+            forecast_grid = float(os.getenv("WEATHER_FORECAST_GRID") or FORECAST_GRID_DEGREES)
+        self.forecast_grid = forecast_grid
+        self.response_cache = ResponseCache()
+        self.pool = _AsyncConnectionPool(
+            max_per_host=max_per_host or int(os.getenv("WEATHER_HTTP_POOL_SIZE", "4")),
+            idle_timeout=float(os.getenv("WEATHER_HTTP_IDLE_TIMEOUT", "30")),
+        )
+
+        self.policies = _default_policies()
+        self._providers: dict = {}
+
+        if hedge is None:
+            hedge = os.getenv("WEATHER_HEDGE_REQUESTS", "").strip().lower() in {"1", "true", "yes"}
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_stats = {"hedged": 0, "alternate_wins": 0}
+        self.latency: dict[tuple, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+        if self.provider == "open-meteo":
+            self.client = self._provider("open-meteo")
+        elif self.provider == "openweather" or self.api_key:
+            self.client = self._provider("openweather")
+        else:
+            self.client = self._provider("open-meteo")
+
+    def _provider(self, name: str):
+        client = self._providers.get(name)
+        if client is None:
+            if name == "openweather":
+                client = AsyncOpenWeatherClient(self.pool, self.api_key, self.response_cache, self.policies[name])
+            else:
+                client = AsyncOpenMeteoClient(
+                    self.pool,
+                    self.geocode_cache,
+                    response_cache=self.response_cache,
+                    policy=self.policies[name],
+                    gazetteer=self.gazetteer,
+                    grid=self.forecast_grid,
+                )
+            self._providers[name] = client
+        return client
+
+    def _alternate(self, client):
+        if isinstance(client, AsyncOpenWeatherClient):
+            return self._provider("open-meteo")
+        if self.api_key:
+            return self._provider("openweather")
+        return None
+
+    async def _call_with_fallback(self, method_name: str, city: str, units: str):
+        client = self.client
+        alternate = self._alternate(client)
+        if self.hedge and alternate is not None:
+            return await self._hedged(client, alternate, method_name, city, units)
+        try:
+            return await self._timed(client, method_name, city, units)
+        except WeatherAPIError as exc:
+            return await self._recover(client, alternate, exc, method_name, city, units)
+
+    async def _recover(self, client, alternate, exc: WeatherAPIError, method_name: str, city, units: str):
+        if isinstance(client, AsyncOpenWeatherClient) and exc.status == 401:
+            if self.client is client:
+                self.client = self._provider("open-meteo")
+            return await self._timed(self.client, method_name, city, units)
+        if alternate is not None and _should_fail_over(exc):
+            return await self._timed(alternate, method_name, city, units)
+        raise exc
+
+    async def _hedged(self, client, alternate, method_name: str, city, units: str):
+        tracker = self.latency.setdefault((client.name, method_name), LatencyTracker())
+        delay = tracker.percentile(self.hedge_percentile, HEDGE_DEFAULT_DELAY)
+
+        primary = asyncio.ensure_future(self._timed(client, method_name, city, units))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            try:
+                return primary.result()
+            except WeatherAPIError as exc:
+                return await self._recover(client, alternate, exc, method_name, city, units)
+
+        with self._lock:
+            self.hedge_stats["hedged"] += 1
+        secondary = asyncio.ensure_future(self._timed(alternate, method_name, city, units))
+        pending = {primary, secondary}
+        errors = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        if task is secondary:
+                            with self._lock:
+                                self.hedge_stats["alternate_wins"] += 1
+                        return task.result()
+                    if not isinstance(exc, WeatherAPIError):
+                        raise exc
+                    errors[task] = exc
+        finally:
+            # The losing request is cancelled, which also closes its pooled connection.
+            for task in pending:
+                task.cancel()
+
+        if isinstance(client, AsyncOpenWeatherClient) and errors[primary].status == 401 and self.client is client:
+            self.client = self._provider("open-meteo")
+        raise errors[secondary]
+
+    async def _timed(self, client, method_name: str, city, units: str):
+        tracker = self.latency.setdefault((client.name, method_name), LatencyTracker())
+        started = time.monotonic()
+        result = await getattr(client, method_name)(city, CANONICAL_UNITS)
+        tracker.record(time.monotonic() - started)
+        return _convert_result(method_name, result, units)
+
+    async def current_weather(self, city: str, units: str = "imperial") -> Dict:
+        return await self._call_with_fallback("current_weather", city, units)
+
+    async def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
+        return await self._call_with_fallback("five_day_forecast", city, units)
+
+    async def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        return await self._call_with_fallback("fetch_bundle", city, units)
+
+    async def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        return await self._call_with_fallback("hourly_forecast", city, units)
+
+    async def forecast_many(
+        self, cities: List[str], units: str = "imperial"
+    ) -> Dict[str, Dict | WeatherAPIError]:
+        return await self._call_with_fallback("forecast_many", cities, units)
+
+    async def _gather(self, method_name: str, cities: List[str], units: str, concurrency: int) -> Dict:
+        limit = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(city: str):
+            async with limit:
+                try:
+                    return await self._call_with_fallback(method_name, city, units)
+                except WeatherAPIError as exc:
+                    return exc
+
+        results = await asyncio.gather(*(one(city) for city in cities))
+        return dict(zip(cities, results))
+
+    # The *_many methods map every requested city to its result, or to the
+    # WeatherAPIError it raised, so one bad city does not sink the batch.
+    async def current_weather_many(
+        self, cities: List[str], units: str = "imperial", concurrency: int = 16
+    ) -> Dict[str, Dict | WeatherAPIError]:
+        return await self._gather("current_weather", cities, units, concurrency)
+
+    async def five_day_forecast_many(
+        self, cities: List[str], units: str = "imperial", concurrency: int = 16
+    ) -> Dict[str, List[Dict] | WeatherAPIError]:
+        return await self._gather("five_day_forecast", cities, units, concurrency)
+
+    async def fetch_bundle_many(
+        self, cities: List[str], units: str = "imperial", concurrency: int = 16
+    ) -> Dict[str, Dict | WeatherAPIError]:
+        return await self._gather("fetch_bundle", cities, units, concurrency)
+
+    def transfer_stats(self) -> dict:
+        return self.pool.stats()
+
+    def cache_stats(self) -> dict:
+        return self.response_cache.stats()
+
+    async def aclose(self) -> None:
+        await self.pool.close()
+
+    async def __aenter__(self) -> "AsyncWeatherClient":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        await self.aclose()
@@ -3,6 +3,8 @@
 import os
 
 datas = [('org.evans.Weather.png', '.')]
+if os.path.exists('cities.gaz'):
+    datas.append(('cities.gaz', '.'))
 icon_file = 'app_icon.ico' if os.path.exists('app_icon.ico') else None
 
 a = Analysis(
@@ -27,6 +29,7 @@ a = Analysis(
         'urllib.parse',
         'urllib.request',
         'requests',
+        'orjson',
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,268 @@
+import argparse
+import contextlib
+import contextvars
+import importlib.util
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from units import CANONICAL_UNITS
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_FAILED = 3
+EXIT_INTERRUPTED = 130
+
+DEFAULT_CONCURRENCY = 4
+# Cities per forecast_many call. Open-Meteo takes up to 100 locations a request; smaller
+# chunks stream results sooner and keep one slow geocode from holding many cities back.
+DEFAULT_BATCH_SIZE = 25
+
+
+def _load_weather_module():
+    path = Path(__file__).with_name("weather-api.py")
+    spec = importlib.util.spec_from_file_location("weather_api_local", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError("Failed to load weather-api.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _read_cities(stream: TextIO) -> Iterator[str]:
+    # One city per line; blank lines and "#" comments are skipped so cron jobs can keep
+    # annotated lists.
+    for line in stream:
+        city = line.strip()
+        if city and not city.startswith("#"):
+            yield city
+
+
+def _city_sources(cities: list[str], files: list[str], stdin: TextIO) -> Iterator[str]:
+    yield from cities
+    for name in files:
+        if name == "-":
+            yield from _read_cities(stdin)
+            continue
+        with open(name, encoding="utf-8") as stream:
+            yield from _read_cities(stream)
+
+
+def _ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _fetch(client, token, chunk: list[tuple[int, str]], units: str) -> list[tuple[int, str, object, dict]]:
+    # A chunk of several cities goes through forecast_many, which shares one Open-Meteo
+    # request per chunk instead of one per city; its cities can only be timed together,
+    # so they report chunk_elapsed_ms and chunk_size. Clients without forecast_many (and
+    # chunks of one) fetch each bundle on its own and report that city's elapsed_ms.
+    # Timed on the worker, so queueing ahead of the chunk is not counted.
+    with token.bound() if token is not None else contextlib.nullcontext():
+        if len(chunk) > 1 and hasattr(client, "forecast_many"):
+            cities = [city for _, city in chunk]
+            started = time.perf_counter()
+            try:
+                results = client.forecast_many(cities, units)
+            except Exception as exc:
+                results = {city: exc for city in cities}
+            timing = {"chunk_elapsed_ms": _ms(started), "chunk_size": len(chunk)}
+            return [(index, city, results[city], timing) for index, city in chunk]
+
+        fetched = []
+        for index, city in chunk:
+            started = time.perf_counter()
+            try:
+                result = client.fetch_bundle(city, units)
+            except Exception as exc:
+                result = exc
+            fetched.append((index, city, result, {"elapsed_ms": _ms(started)}))
+        return fetched
+
+
+def _record(index: int, city: str, units: str, result, timing: dict) -> dict:
+    ok = not isinstance(result, Exception)
+    record = {"index": index, "city": city, "ok": ok, **timing}
+    if ok:
+        record.update(
+            units=units,
+            fetched_at=result.get("fetched_at"),
+            current=result["current"],
+            forecast=result["forecast"],
+        )
+    else:
+        record.update(
+            error=str(result) or type(result).__name__,
+            status=getattr(result, "status", None),
+            retryable=getattr(result, "retryable", False),
+        )
+    return record
+
+
+def run(
+    client,
+    cities: Iterable[str],
+    out: TextIO,
+    units: str = CANONICAL_UNITS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    token=None,
+) -> tuple[int, int]:
+    # Streams one JSON line per city as its chunk completes; "index" is the city's
+    # position in the input. At most 2x `concurrency` chunks are queued at a time, so a
+    # long list from stdin is consumed as it is fetched rather than read up front.
+    # Returns (succeeded, failed). Cancelling `token` aborts whatever is still in flight.
+    concurrency = max(1, concurrency)
+    batch_size = max(1, batch_size)
+    source = enumerate(cities)
+    succeeded = failed = 0
+    pending: set = set()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="weather-batch") as executor:
+        try:
+            while True:
+                while len(pending) < concurrency * 2:
+                    chunk = list(itertools.islice(source, batch_size))
+                    if not chunk:
+                        break
+                    pending.add(executor.submit(contextvars.copy_context().run, _fetch, client, token, chunk, units))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for index, city, result, timing in future.result():
+                        if isinstance(result, Exception):
+                            failed += 1
+                        else:
+                            succeeded += 1
+                        out.write(json.dumps(_record(index, city, units, result, timing)) + "\n")
+                    out.flush()
+        except BaseException:
+            if token is not None:
+                token.cancel()
+            for future in pending:
+                future.cancel()
+            raise
+    return succeeded, failed
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m batch",
+        description="Fetch current weather and the 5-day forecast for many cities, one JSON line per city.",
+        epilog=(
+            "exit status: 0 every city succeeded, 1 some failed, 2 usage or input error, "
+            "3 every city failed, 130 interrupted"
+        ),
+    )
+    parser.add_argument("cities", nargs="*", help="city names or \"lat, lon\" coordinates")
+    parser.add_argument(
+        "-f",
+        "--file",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="read cities from PATH, one per line ('-' for stdin); may be repeated",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"chunks fetched at once (default {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=(
+            f"cities per forecast request (default {DEFAULT_BATCH_SIZE}); their lines share one "
+            "chunk_elapsed_ms and carry chunk_size. 1 fetches and times each city on its own (elapsed_ms)"
+        ),
+    )
+    parser.add_argument(
+        "-u",
+        "--units",
+        choices=["metric", "imperial"],
+        default=CANONICAL_UNITS,
+        help=f"units of the output (default {CANONICAL_UNITS})",
+    )
+    parser.add_argument("--provider", help="weather provider (default WEATHER_PROVIDER or auto)")
+    parser.add_argument("-o", "--output", metavar="PATH", help="write JSON lines to PATH instead of stdout")
+    parser.add_argument("--stats", action="store_true", help="print cache and transfer stats to stderr when done")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    files = list(args.file)
+    if not args.cities and not files:
+        if sys.stdin.isatty():
+            parser.error("no cities given (pass them as arguments, with --file, or on stdin)")
+        files = ["-"]
+    for name in files:
+        if name != "-" and not os.access(name, os.R_OK):
+            parser.error(f"cannot read {name}")
+
+    weather_api = _load_weather_module()
+    try:
+        client = weather_api.WeatherClient(provider=args.provider)
+    except weather_api.WeatherAPIError as exc:
+        print(f"batch: {exc}", file=sys.stderr)
+        return EXIT_FAILED
+
+    try:
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    except OSError as exc:
+        print(f"batch: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    started = time.perf_counter()
+    try:
+        succeeded, failed = run(
+            client,
+            _city_sources(args.cities, files, sys.stdin),
+            out,
+            args.units,
+            args.concurrency,
+            args.batch_size,
+            weather_api.CancelToken(),
+        )
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); point stdout at devnull so the flush at
+        # interpreter exit does not raise again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_PARTIAL
+    except (OSError, UnicodeDecodeError) as exc:
+        print(f"batch: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"batch: {succeeded} ok, {failed} failed in {elapsed:.1f}s", file=sys.stderr)
+    if args.stats:
+        stats = {"cache": client.cache_stats(), "transfer": client.transfer_stats()}
+        print(json.dumps(stats), file=sys.stderr)
+    if failed and not succeeded:
+        return EXIT_FAILED
+    if failed:
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -47,6 +47,13 @@ fi
 cd "$SCRIPT_DIR"
 rm -rf "$APPDIR" "$DIST_DIR" "$BUILD_DIR" "${APP_NAME}.spec" "${APP_ID}.spec"
 
+GAZETTEER_DATA=()
+if [ -f cities.gaz ]; then
+  GAZETTEER_DATA=(--add-data "cities.gaz:.")
+else
+  echo "cities.gaz not found; run ./build-gazetteer.sh to bundle the offline gazetteer."
+fi
+
 python3 -m PyInstaller \
   --noconfirm \
   --clean \
@@ -59,6 +66,7 @@ python3 -m PyInstaller \
   --hidden-import=gi.repository.Gio \
   --hidden-import=gi.repository.GLib \
   --add-data "weather-api.py:." \
+  ${GAZETTEER_DATA[@]+"${GAZETTEER_DATA[@]}"} \
   "$ENTRY"
 
 mkdir -p "$APPDIR/usr/bin"
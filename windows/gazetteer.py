@@ -0,0 +1,485 @@
+import argparse
+import bisect
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+GAZETTEER_PATH = Path(os.getenv("WEATHER_GAZETTEER") or Path(__file__).with_name("cities.gaz"))
+
+_MAGIC = b"WXG1"
+_VERSION = 1
+# magic, version, entry size, entry count, offset of the string pool.
+_HEADER = struct.Struct("<4sHHII")
+# Key, name and country as (offset into the pool, byte length), ISO country code,
+# latitude and longitude in 1e-5 degrees, population.
+_ENTRY = struct.Struct("<IHIHIH2siiI")
+_SCALE = 100_000
+# Prefixes up to this many bytes match too many places to rank per keystroke; their
+# top candidates are computed once, in one pass over the file.
+_SHORT_PREFIX = 2
+_TOP_CANDIDATES = 32
+# Places are found by coordinates through a Z-order (bit-interleaved, geohash-like) code
+# of CELL_BITS per axis: every grid cell at every coarser level is one contiguous range
+# of the sorted codes, so looking at a cell is two bisects.
+_CELL_BITS = 16
+_EARTH_RADIUS_KM = 6371.0088
+_FIRST_RADIUS_KM = 10.0
+_MAX_CELLS = 32
+# A coordinate query is named after the nearest known place only when it is this close.
+NEAREST_PLACE_KM = 25.0
+
+_COORDINATES = re.compile(r"^\s*([+-]?\d{1,3}(?:\.\d+)?)\s*[,\s]\s*([+-]?\d{1,3}(?:\.\d+)?)\s*$")
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.casefold().split())
+
+
+def parse_coordinates(text: str) -> tuple[float, float] | None:
+    # "48.8566,2.3522", "48.8566, 2.3522" or "48.8566 2.3522": latitude first.
+    match = _COORDINATES.match(text)
+    if match is None:
+        return None
+    latitude, longitude = float(match.group(1)), float(match.group(2))
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def format_coordinates(latitude: float, longitude: float) -> str:
+    return f"{latitude:.4f}, {longitude:.4f}"
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _spread_bits(value: int) -> int:
+    value = (value | (value << 8)) & 0x00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F
+    value = (value | (value << 2)) & 0x33333333
+    return (value | (value << 1)) & 0x55555555
+
+
+def _grid(latitude: float, longitude: float) -> tuple[int, int]:
+    top = (1 << _CELL_BITS) - 1
+    x = min(top, max(0, int((longitude + 180) / 360 * (1 << _CELL_BITS))))
+    y = min(top, max(0, int((latitude + 90) / 180 * (1 << _CELL_BITS))))
+    return x, y
+
+
+def _z_code(x: int, y: int) -> int:
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+def _cell_ranges(codes: array, latitude: float, longitude: float, radius_km: float) -> set[tuple[int, int]]:
+    # Index ranges of the grid cells covering the bounding box of a circle, at the
+    # finest level where that takes at most _MAX_CELLS cells. Near the poles the box is a
+    # thin band around the globe, so this is many cells along it rather than a few huge
+    # square ones.
+    cells = 1 << _CELL_BITS
+    angle = radius_km / _EARTH_RADIUS_KM
+    south, north = latitude - math.degrees(angle), latitude + math.degrees(angle)
+    if south <= -90 or north >= 90 or angle >= math.pi / 2:
+        # The circle takes in a pole, so every longitude.
+        west, east = 0, cells - 1
+    else:
+        spread = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude)))))
+        west = math.floor((longitude - spread + 180) / 360 * cells)
+        east = math.floor((longitude + spread + 180) / 360 * cells)
+        if east - west >= cells - 1:
+            west, east = 0, cells - 1
+    _, bottom = _grid(max(-90.0, south), longitude)
+    _, top = _grid(min(90.0, north), longitude)
+    shift = 0
+    while ((east >> shift) - (west >> shift) + 1) * ((top >> shift) - (bottom >> shift) + 1) > _MAX_CELLS:
+        shift += 1
+    level_cells = cells >> shift
+    ranges = set()
+    for cy in range(bottom >> shift, (top >> shift) + 1):
+        for cx in range(west >> shift, (east >> shift) + 1):
+            first = _z_code(cx % level_cells, cy) << (2 * shift)
+            lo = bisect.bisect_left(codes, first)
+            ranges.add((lo, bisect.bisect_left(codes, first + (1 << (2 * shift)), lo)))
+    return ranges
+
+
+def resolve_coordinates(query: str, gazetteer: "Gazetteer | None" = None) -> dict | None:
+    # A location for "lat,lon" input without any geocoding: the weather is for the exact
+    # point, named after the nearest known place when one is close. None for anything
+    # that is not coordinates.
+    coordinates = parse_coordinates(query)
+    if coordinates is None:
+        return None
+    latitude, longitude = coordinates
+    location = {
+        "name": format_coordinates(latitude, longitude),
+        "country": "",
+        "latitude": latitude,
+        "longitude": longitude,
+    }
+    if gazetteer is not None:
+        nearest = gazetteer.nearest(latitude, longitude, 1, max_km=NEAREST_PLACE_KM)
+        if nearest:
+            location["name"] = nearest[0]["name"]
+            location["country"] = nearest[0]["country"]
+    return location
+
+
+class Gazetteer:
+    # Read-only view of a cities.gaz file. Entries are sorted by the UTF-8 bytes of the
+    # normalized name, most populous first within a name, so a lookup is a binary search
+    # over a memory map: only the pages a search touches are read, nothing is parsed up
+    # front, and the file is shared between processes through the page cache.
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, entry_size, count, pool = _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic = None
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or entry_size != _ENTRY.size
+            or _HEADER.size + count * _ENTRY.size > pool
+            or pool > len(self._map)
+        ):
+            self._map.close()
+            raise ValueError(f"Not a gazetteer file: {self.path}")
+        self._count = count
+        self._pool = pool
+        self._top_lock = threading.Lock()
+        self._top: dict[bytes, list[int]] | None = None
+        self._spatial_lock = threading.Lock()
+        self._spatial: tuple[array, array] | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> tuple:
+        return _ENTRY.unpack_from(self._map, _HEADER.size + i * _ENTRY.size)
+
+    def _text(self, offset: int, length: int) -> bytes:
+        start = self._pool + offset
+        return self._map[start : start + length]
+
+    def _key(self, i: int) -> bytes:
+        offset, length = struct.unpack_from("<IH", self._map, _HEADER.size + i * _ENTRY.size)
+        return self._text(offset, length)
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _upper_bound(self, prefix: bytes) -> int:
+        # First entry past every key that starts with `prefix`.
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid)[: len(prefix)] <= prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _column(self, lo: int, hi: int, word: int, code: str) -> list[int]:
+        # Latitude, longitude and population are 4-byte aligned words of every 32-byte
+        # entry, so a column is a strided view of the map; no per-entry unpacking.
+        start = _HEADER.size + lo * _ENTRY.size
+        with memoryview(self._map) as whole, whole[start : start + (hi - lo) * _ENTRY.size] as rows:
+            with rows.cast(code) as words, words[word :: _ENTRY.size // 4] as column:
+                return column.tolist()
+
+    def _populations(self, lo: int, hi: int) -> list[int]:
+        return self._column(lo, hi, 7, "I")
+
+    def _top_in_range(self, lo: int, hi: int, limit: int) -> list[int]:
+        populations = self._populations(lo, hi)
+        best = heapq.nlargest(limit, range(len(populations)), key=populations.__getitem__)
+        return [lo + i for i in best]
+
+    def _short_prefix_table(self) -> dict[bytes, list[int]]:
+        with self._top_lock:
+            if self._top is None:
+                top: dict[bytes, list[int]] = {}
+                lo = 0
+                while lo < self._count:
+                    prefix = self._key(lo)[:_SHORT_PREFIX]
+                    hi = self._upper_bound(prefix)
+                    top[prefix] = self._top_in_range(lo, hi, _TOP_CANDIDATES)
+                    lo = hi
+                for length in range(_SHORT_PREFIX - 1, 0, -1):
+                    for prefix, members in list(top.items()):
+                        if len(prefix) > length:
+                            top.setdefault(prefix[:length], []).extend(members)
+                    for prefix in [prefix for prefix in top if len(prefix) == length]:
+                        members = sorted(set(top[prefix]))
+                        populations = {i: self._entry(i)[-1] for i in members}
+                        top[prefix] = heapq.nlargest(_TOP_CANDIDATES, members, key=populations.__getitem__)
+                self._top = top
+            return self._top
+
+    def warm(self) -> None:
+        # Builds the short-prefix table ahead of the first keystroke.
+        self._short_prefix_table()
+
+    def complete(self, prefix: str, limit: int = 8) -> list[dict]:
+        # The most populous places whose name starts with `prefix`, each place once even
+        # though it may be indexed under two names.
+        key = _name_key(prefix).encode("utf-8")
+        if not key:
+            return []
+        if len(key) <= _SHORT_PREFIX:
+            candidates = self._short_prefix_table().get(key, [])
+        else:
+            lo = self._lower_bound(key)
+            hi = self._upper_bound(key)
+            candidates = self._top_in_range(lo, hi, limit * 2)
+        results = []
+        seen = set()
+        for i in candidates:
+            location = self._location(self._entry(i))
+            identity = (location["name"], location["country_code"], location["latitude"], location["longitude"])
+            if identity in seen:
+                continue
+            seen.add(identity)
+            results.append(location)
+            if len(results) == limit:
+                break
+        return results
+
+    def _spatial_index(self) -> tuple[array, array]:
+        # Z-order codes, sorted, and the entry each one belongs to. Places indexed under
+        # two names appear once.
+        with self._spatial_lock:
+            if self._spatial is None:
+                latitudes = self._column(0, self._count, 5, "i")
+                longitudes = self._column(0, self._count, 6, "i")
+                populations = self._populations(0, self._count)
+                # Grid units straight from the 1e-5 degree integers, as _grid computes them.
+                top = (1 << _CELL_BITS) - 1
+                lat_scale = (1 << _CELL_BITS) / (180 * _SCALE)
+                lon_scale = (1 << _CELL_BITS) / (360 * _SCALE)
+                first: dict[tuple[int, int, int], int] = {}
+                for i, place in enumerate(zip(latitudes, longitudes, populations)):
+                    first.setdefault(place, i)
+                spread = _spread_bits
+                # Code and entry packed into one int: sorting plain ints is much cheaper
+                # than sorting pairs.
+                packed = sorted(
+                    (
+                        spread(min(top, max(0, int((lon + 180 * _SCALE) * lon_scale))))
+                        | spread(min(top, max(0, int((lat + 90 * _SCALE) * lat_scale)))) << 1
+                    )
+                    << 32
+                    | i
+                    for (lat, lon, _), i in first.items()
+                )
+                self._spatial = (array("Q", [p >> 32 for p in packed]), array("I", [p & 0xFFFFFFFF for p in packed]))
+            return self._spatial
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1, max_km: float | None = None) -> list[dict]:
+        # The k closest places, nearest first, each with its "distance_km". Searches the
+        # cells covering a circle around the point, widening it until k places fall
+        # inside; each round is a handful of bisects over the sorted codes plus the
+        # places in those cells.
+        codes, order = self._spatial_index()
+        if not codes or k <= 0:
+            return []
+        everywhere = math.pi * _EARTH_RADIUS_KM
+        radius = _FIRST_RADIUS_KM if max_km is None else min(_FIRST_RADIUS_KM, max_km)
+        while True:
+            candidates = []
+            for lo, hi in _cell_ranges(codes, latitude, longitude, radius):
+                for j in range(lo, hi):
+                    entry = order[j]
+                    lat, lon = struct.unpack_from("<ii", self._map, _HEADER.size + entry * _ENTRY.size + 20)
+                    candidates.append((distance_km(latitude, longitude, lat / _SCALE, lon / _SCALE), entry))
+            best = heapq.nsmallest(k, candidates)
+            # Places outside the cells are farther than `radius`, so only what is within
+            # it is certain.
+            if len(best) == k and best[-1][0] <= radius:
+                break
+            if radius >= everywhere or (max_km is not None and radius >= max_km):
+                break
+            # With k candidates the k-th one bounds the answer; otherwise keep widening.
+            radius = best[-1][0] if len(best) == k else radius * 2
+            if max_km is not None:
+                radius = min(radius, max_km)
+        results = []
+        for distance, entry in best:
+            if distance > radius:
+                break
+            location = self._location(self._entry(entry))
+            location["distance_km"] = distance
+            results.append(location)
+        return results
+
+    def _location(self, entry: tuple) -> dict:
+        _, _, name_offset, name_length, country_offset, country_length, code, lat, lon, population = entry
+        return {
+            "name": self._text(name_offset, name_length).decode("utf-8"),
+            "country": self._text(country_offset, country_length).decode("utf-8"),
+            "country_code": code.rstrip(b"\0").decode("ascii"),
+            "latitude": lat / _SCALE,
+            "longitude": lon / _SCALE,
+            "population": population,
+        }
+
+    def matches(self, name: str) -> list[dict]:
+        key = _name_key(name).encode("utf-8")
+        if not key:
+            return []
+        results = []
+        i = self._lower_bound(key)
+        while i < self._count:
+            entry = self._entry(i)
+            if self._text(entry[0], entry[1]) != key:
+                break
+            results.append(self._location(entry))
+            i += 1
+        return results
+
+    def lookup(self, query: str) -> dict | None:
+        # "Paris", or "Paris, FR" / "Paris, France" to pick a country. Without one the
+        # most populous place of that name wins, as with the Open-Meteo geocoder.
+        name, _, qualifier = query.partition(",")
+        qualifier = _name_key(qualifier)
+        for location in self.matches(name):
+            if not qualifier or qualifier in (location["country_code"].casefold(), location["country"].casefold()):
+                return location
+        return None
+
+    def close(self) -> None:
+        self._map.close()
+
+
+_default: Gazetteer | None = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+
+def default_gazetteer() -> Gazetteer | None:
+    # The bundled file is optional: without it every lookup goes to the network.
+    global _default, _default_loaded
+    with _default_lock:
+        if not _default_loaded:
+            _default_loaded = True
+            try:
+                _default = Gazetteer(GAZETTEER_PATH)
+            except (OSError, ValueError):
+                _default = None
+        return _default
+
+
+def build_gazetteer(rows: Iterable[tuple], path: Path | str) -> int:
+    # rows are (name, ascii_name, country_code, country, latitude, longitude, population).
+    # Each place is indexed under its name and its ASCII name when they differ, so
+    # "Zurich" finds Zürich. Returns the number of entries written.
+    pool = bytearray()
+    interned: dict[bytes, tuple[int, int]] = {}
+
+    def intern(text: str) -> tuple[int, int]:
+        data = text.encode("utf-8")[:0xFFFF]
+        if data not in interned:
+            interned[data] = (len(pool), len(data))
+            pool.extend(data)
+        return interned[data]
+
+    keyed = []
+    for name, ascii_name, code, country, latitude, longitude, population in rows:
+        for key in {_name_key(name), _name_key(ascii_name)} - {""}:
+            keyed.append((key.encode("utf-8"), -population, name, code, country, latitude, longitude, population))
+    keyed.sort(key=lambda item: (item[0], item[1]))
+
+    entries = bytearray()
+    for key, _, name, code, country, latitude, longitude, population in keyed:
+        entries += _ENTRY.pack(
+            *intern(key.decode("utf-8")),
+            *intern(name),
+            *intern(country),
+            code.encode("ascii", "replace")[:2],
+            round(latitude * _SCALE),
+            round(longitude * _SCALE),
+            max(0, min(population, 0xFFFFFFFF)),
+        )
+
+    path = Path(path)
+    header = _HEADER.pack(_MAGIC, _VERSION, _ENTRY.size, len(keyed), _HEADER.size + len(entries))
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(entries)
+            f.write(pool)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return len(keyed)
+
+
+def read_geonames(cities_path: Path | str, country_info_path: Path | str | None = None) -> Iterator[tuple]:
+    # GeoNames dumps (https://download.geonames.org/export/dump/), e.g. cities15000.txt,
+    # plus countryInfo.txt for country names; without it the ISO code stands in.
+    countries: dict[str, str] = {}
+    if country_info_path is not None:
+        with open(country_info_path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#"):
+                    continue
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) > 4:
+                    countries[fields[0]] = fields[4]
+    with open(cities_path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 15:
+                continue
+            code = fields[8]
+            yield (
+                fields[1],
+                fields[2],
+                code,
+                countries.get(code, code),
+                float(fields[4]),
+                float(fields[5]),
+                int(fields[14] or 0),
+            )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the offline city gazetteer from a GeoNames dump.")
+    parser.add_argument("cities", help="GeoNames cities file, e.g. cities15000.txt")
+    parser.add_argument("--countries", help="GeoNames countryInfo.txt, for country names")
+    parser.add_argument("-o", "--output", default=str(Path(__file__).with_name("cities.gaz")))
+    args = parser.parse_args(argv)
+    count = build_gazetteer(read_geonames(args.cities, args.countries), args.output)
+    print(f"Wrote {count} entries to {args.output} ({os.path.getsize(args.output)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import bisect
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+from settings import SETTINGS_PATH
+from units import celsius_to, kmh_to, to_celsius, to_kmh
+
+HISTORY_DIR = SETTINGS_PATH.with_name("history")
+
+_MAGIC = b"WXH1"
+_HEADER = struct.Struct("<4sHH")
+# timestamp, temp and feels_like in 0.01 C, wind in 0.1 km/h, humidity %, weather code.
+# Open-Meteo codes are WMO (0-99) and OpenWeather condition ids are 200-804, so both fit.
+_RECORD = struct.Struct("<IhhHBxH")
+_MISSING_TEMP = -0x8000
+_MISSING_U16 = 0xFFFF
+_MISSING_U8 = 0xFF
+INDEX_STRIDE = 256
+
+
+def _history_key(city: str) -> str:
+    return " ".join(city.casefold().split())
+
+
+def _history_filename(city: str) -> str:
+    key = _history_key(city)
+    slug = re.sub(r"[^a-z0-9]+", "-", key).strip("-")[:40] or "city"
+    return f"{slug}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]}.wxh"
+
+
+def _pack_temp(value, units: str) -> int:
+    if value is None:
+        return _MISSING_TEMP
+    celsius = to_celsius(float(value), units)
+    return max(-0x7FFF, min(0x7FFF, round(celsius * 100)))
+
+
+def _unpack_temp(raw: int, units: str) -> float | None:
+    if raw == _MISSING_TEMP:
+        return None
+    return celsius_to(raw / 100, units)
+
+
+def _pack_wind(value, units: str) -> int:
+    if value is None:
+        return _MISSING_U16
+    kmh = to_kmh(float(value), units)
+    return max(0, min(_MISSING_U16 - 1, round(kmh * 10)))
+
+
+def _unpack_wind(raw: int, units: str) -> float | None:
+    if raw == _MISSING_U16:
+        return None
+    return kmh_to(raw / 10, units)
+
+
+def _pack_small(value, missing: int) -> int:
+    if value is None:
+        return missing
+    return max(0, min(missing - 1, int(value)))
+
+
+class CityHistory:
+    # One append-only file of fixed-width records per city. Reads go through a read-only
+    # mmap and a sparse in-memory index (every INDEX_STRIDE-th timestamp), so a range
+    # query is a bisect over the index plus one over a single block of the map.
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._map: mmap.mmap | None = None
+        self._count = 0
+        self._index: list[int] = []
+        self._last_ts = 0
+        self._torn = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size < _HEADER.size:
+            # A crash while the header was written; append starts the file over.
+            self._torn = size > 0
+            return
+        with self.path.open("rb") as f:
+            magic, _, record_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or record_size != _RECORD.size:
+            # Not ours (another layout, or damaged); move it aside rather than misreading
+            # or deleting it, and start a new file.
+            self.path.replace(self.path.with_name(self.path.name + ".bak"))
+            return
+        # A torn write from a crash leaves a partial record at the end; ignore it.
+        self._count, tail = divmod(size - _HEADER.size, _RECORD.size)
+        self._torn = tail != 0
+        view = self._view()
+        if view is not None and self._count:
+            self._index = [self._timestamp_at(view, i) for i in range(0, self._count, INDEX_STRIDE)]
+            self._last_ts = self._timestamp_at(view, self._count - 1)
+
+    def _view(self) -> mmap.mmap | None:
+        if self._map is None and self._count:
+            with self.path.open("rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    @staticmethod
+    def _timestamp_at(view: mmap.mmap, i: int) -> int:
+        return struct.unpack_from("<I", view, _HEADER.size + i * _RECORD.size)[0]
+
+    def append(self, record: bytes, timestamp: int, min_interval: float = 0.0) -> bool:
+        with self._lock:
+            if self._count and timestamp - self._last_ts < max(1.0, min_interval):
+                return False
+            # Mapped files cannot grow under the map on every platform, so drop it and
+            # remap lazily on the next read.
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                if self._torn:
+                    # Overwrite the torn tail instead of appending after it; without a
+                    # whole record the header may be torn too, so rewrite it.
+                    f.truncate(_HEADER.size + self._count * _RECORD.size if self._count else 0)
+                    f.seek(0, os.SEEK_END)
+                    self._torn = False
+                if f.tell() == 0:
+                    f.write(_HEADER.pack(_MAGIC, 1, _RECORD.size))
+                f.write(record)
+            if self._count % INDEX_STRIDE == 0:
+                self._index.append(timestamp)
+            self._count += 1
+            self._last_ts = timestamp
+            return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _lower_bound(self, view: mmap.mmap, timestamp: int) -> int:
+        block = max(0, bisect.bisect_left(self._index, timestamp) - 1)
+        lo = block * INDEX_STRIDE
+        hi = min(self._count, lo + 2 * INDEX_STRIDE)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp_at(view, mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def records(self, start: float | None = None, end: float | None = None) -> list[tuple]:
+        with self._lock:
+            view = self._view()
+            if view is None:
+                return []
+            first = 0 if start is None else self._lower_bound(view, int(start))
+            last = self._count if end is None else self._lower_bound(view, int(end) + 1)
+            if last <= first:
+                return []
+            offset = _HEADER.size + first * _RECORD.size
+            with memoryview(view) as whole, whole[offset : offset + (last - first) * _RECORD.size] as chunk:
+                return list(_RECORD.iter_unpack(chunk))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+
+class HistoryStore:
+    # Keeps every current_weather observation the app sees, one file per city, in
+    # metric units. A sample closer than `min_interval` to the previous one is dropped
+    # so cache hits and quick refreshes do not pile up duplicates.
+    def __init__(self, directory: Path | str = HISTORY_DIR, min_interval: float = 300.0):
+        self.directory = Path(directory)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._cities: dict[str, CityHistory] = {}
+
+    def _city(self, city: str) -> CityHistory:
+        key = _history_key(city)
+        with self._lock:
+            history = self._cities.get(key)
+            if history is None:
+                history = CityHistory(self.directory / _history_filename(city))
+                self._cities[key] = history
+            return history
+
+    def append(self, city: str, current: dict, units: str, timestamp: float | None = None) -> bool:
+        ts = int(time.time() if timestamp is None else timestamp)
+        try:
+            record = _RECORD.pack(
+                ts,
+                _pack_temp(current.get("temp"), units),
+                _pack_temp(current.get("feels_like"), units),
+                _pack_wind(current.get("wind"), units),
+                _pack_small(current.get("humidity"), _MISSING_U8),
+                _pack_small(current.get("code"), _MISSING_U16),
+            )
+            return self._city(city).append(record, ts, self.min_interval)
+        except (OSError, ValueError, TypeError, struct.error):
+            # History is a nice-to-have; a full disk or odd payload must not break refreshes.
+            return False
+
+    def observations(
+        self,
+        city: str,
+        units: str = "imperial",
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[dict]:
+        try:
+            rows = self._city(city).records(start, end)
+        except OSError:
+            return []
+        return [
+            {
+                "timestamp": ts,
+                "temp": _unpack_temp(temp, units),
+                "feels_like": _unpack_temp(feels_like, units),
+                "humidity": None if humidity == _MISSING_U8 else humidity,
+                "wind": _unpack_wind(wind, units),
+                "code": None if code == _MISSING_U16 else code,
+            }
+            for ts, temp, feels_like, wind, humidity, code in rows
+        ]
+
+    def stats(self, city: str, units: str = "imperial", start: float | None = None, end: float | None = None) -> dict:
+        temps = [row["temp"] for row in self.observations(city, units, start, end) if row["temp"] is not None]
+        if not temps:
+            return {"count": 0, "temp_min": None, "temp_max": None, "temp_mean": None}
+        return {
+            "count": len(temps),
+            "temp_min": min(temps),
+            "temp_max": max(temps),
+            "temp_mean": math.fsum(temps) / len(temps),
+        }
+
+    def size_bytes(self) -> int:
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".wxh"))
+        except OSError:
+            return 0
+
+    def close(self) -> None:
+        with self._lock:
+            histories = list(self._cities.values())
+            self._cities.clear()
+        for history in histories:
+            history.close()
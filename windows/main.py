@@ -1,16 +1,27 @@
+import time
+
+_STARTED = time.perf_counter()
+
 import os
+import sys
 
-if os.name == "nt":
-    from pyside_ui import WeatherQtApp
-else:
-    from ui import WeatherApp
+from startup import StartupProfile, profile_requested
 
 
-def main():
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    profile = StartupProfile(_STARTED, enabled=profile_requested(argv))
+    # The toolkit and the UI load here rather than at module level so the profile covers them.
     if os.name == "nt":
-        WeatherQtApp.run_app()
+        from pyside_ui import WeatherQtApp
+
+        profile.mark("imports")
+        WeatherQtApp.run_app(profile)
     else:
-        app = WeatherApp()
+        from ui import WeatherApp
+
+        profile.mark("imports")
+        app = WeatherApp(profile=profile)
         app.run(None)
 
 
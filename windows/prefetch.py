@@ -0,0 +1,161 @@
+import itertools
+import queue
+import random
+import threading
+import time
+from typing import Callable
+
+HIGH_PRIORITY = 0
+LOW_PRIORITY = 1
+
+
+def _store_key(city: str, units: str) -> tuple[str, str]:
+    return " ".join(city.casefold().split()), units
+
+
+class FavoritesPrefetcher:
+    # Keeps the latest bundle for every favorite in memory so the UI can switch
+    # between saved cities without waiting on the network. A full sweep runs at
+    # startup and then every `interval` seconds (+/- jitter) on a small worker pool;
+    # prioritize() jumps a single city ahead of the sweep.
+    def __init__(
+        self,
+        client,
+        interval: float = 600.0,
+        jitter: float = 0.2,
+        workers: int = 2,
+        on_update: Callable[[str, str, dict], None] | None = None,
+    ):
+        self.client = client
+        self.interval = interval
+        self.jitter = jitter
+        self.workers = max(1, workers)
+        self.on_update = on_update
+
+        self._lock = threading.Lock()
+        self._store: dict[tuple[str, str], tuple[float, dict]] = {}
+        self._cities: list[str] = []
+        self._units = "imperial"
+        self._focus: str | None = None
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._queued: set[tuple[str, str]] = set()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self, cities: list[str], units: str) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            self._cities = list(cities)
+            self._units = units
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._schedule, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        for _ in range(self.workers):
+            self._queue.put((-1, next(self._seq), None))
+
+    def set_cities(self, cities: list[str]) -> None:
+        with self._lock:
+            added = [city for city in cities if city not in self._cities]
+            self._cities = list(cities)
+        if added:
+            self._enqueue(("batch", added, self._units), LOW_PRIORITY)
+
+    def set_units(self, units: str) -> None:
+        with self._lock:
+            if units == self._units:
+                return
+            self._units = units
+        self._wake.set()
+
+    def prioritize(self, city: str) -> None:
+        with self._lock:
+            self._focus = city
+            units = self._units
+        self._enqueue(("city", city, units), HIGH_PRIORITY)
+
+    def get(self, city: str, units: str) -> tuple[float, dict] | None:
+        with self._lock:
+            return self._store.get(_store_key(city, units))
+
+    def put(self, city: str, units: str, bundle: dict) -> None:
+        with self._lock:
+            self._store[_store_key(city, units)] = (bundle.get("fetched_at") or time.time(), bundle)
+
+    def _enqueue(self, job: tuple, priority: int) -> None:
+        if job[0] == "city":
+            key = ("city",) + _store_key(job[1], job[2])
+        else:
+            key = ("batch", tuple(job[1]), job[2])
+        with self._lock:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+        self._queue.put((priority, next(self._seq), (key, job)))
+
+    def _schedule(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                cities = list(self._cities)
+                focus = self._focus
+                units = self._units
+            if focus:
+                self._enqueue(("city", focus, units), HIGH_PRIORITY)
+            if cities:
+                self._enqueue(("batch", cities, units), LOW_PRIORITY)
+
+            delay = self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            self._wake.wait(max(1.0, delay))
+            self._wake.clear()
+
+    def _work(self) -> None:
+        while True:
+            _, _, item = self._queue.get()
+            if item is None or self._stop.is_set():
+                return
+            key, job = item
+            with self._lock:
+                self._queued.discard(key)
+            try:
+                if job[0] == "city":
+                    self._fetch_city(job[1], job[2])
+                else:
+                    self._fetch_batch(job[1], job[2])
+            except Exception:  # noqa: BLE001
+                # A failed sweep just leaves the previous bundles in place until the next one.
+                continue
+
+    def _fetch_city(self, city: str, units: str) -> None:
+        bundle = self.client.fetch_bundle(city, units)
+        self._publish(city, units, bundle)
+
+    def _fetch_batch(self, cities: list[str], units: str) -> None:
+        forecast_many = getattr(self.client, "forecast_many", None)
+        if forecast_many is None:
+            for city in cities:
+                if self._stop.is_set():
+                    return
+                try:
+                    self._fetch_city(city, units)
+                except Exception:  # noqa: BLE001
+                    continue
+            return
+
+        for city, bundle in forecast_many(cities, units).items():
+            if isinstance(bundle, dict):
+                self._publish(city, units, bundle)
+
+    def _publish(self, city: str, units: str, bundle: dict) -> None:
+        self.put(city, units, bundle)
+        if self.on_update is not None:
+            self.on_update(city, units, bundle)
@@ -2,11 +2,26 @@ from __future__ import annotations
 
 import os
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
-from settings import load_settings, save_settings
-from weather_api import WeatherAPIError, WeatherClient
+from autocomplete import REMOTE_DELAY_MS, REMOTE_MIN_CHARS, CityIndex, location_label, merge_suggestions
+from gazetteer import parse_coordinates
+from prefetch import FavoritesPrefetcher
+from history import HistoryStore
+from settings import SettingsStore
+from snapshots import SnapshotStore, format_as_of, stale_as_of
+from startup import StartupProfile
+from units import CANONICAL_UNITS, convert_current, convert_forecast
+
+
+def _load_weather_module():
+    # Imported on first use, normally on the refresh executor once the window is up: it
+    # pulls in requests, ssl and http.client, which dominate a cold start.
+    import weather_api
+
+    return weather_api
 
 
 _LIGHT_QSS = """
@@ -139,30 +154,114 @@ QListWidget::item:selected {
 
 class WeatherWindow(QtWidgets.QMainWindow):
     weather_ready = QtCore.Signal(object, object, object, object)
-    weather_error = QtCore.Signal(object, object)
+    weather_error = QtCore.Signal(object, object, object)
     network_test_done = QtCore.Signal(object, object, object)
+    prefetch_ready = QtCore.Signal(object, object, object)
+    client_ready = QtCore.Signal(object)
+    suggestions_ready = QtCore.Signal(object, object, object)
 
-    def __init__(self):
+    def __init__(self, profile: StartupProfile | None = None):
         super().__init__()
+        self.profile = profile if profile is not None else StartupProfile(enabled=False)
         self.setWindowTitle("Weather Dashboard")
         self.resize(1100, 760)
         icon_path = os.path.join(os.path.dirname(__file__), "org.evans.Weather.png")
         if os.path.exists(icon_path):
             self.setWindowIcon(QtGui.QIcon(icon_path))
 
-        self.settings = load_settings()
-        self.client = WeatherClient()
+        self.settings = SettingsStore()
+        # Both are created once the window has painted; see _on_first_paint.
+        self.client = None
+        self.prefetcher: FavoritesPrefetcher | None = None
+        self._painted = False
+        self.snapshots = SnapshotStore()
+        self.history = HistoryStore()
         self._request_token = 0
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-refresh")
+        self._active_future: Future | None = None
+        self._active_cancel = None
+        self.refresh_stats = {"completed": 0, "abandoned": 0}
+        # What is on screen, in CANONICAL_UNITS, so a units switch only re-renders it.
+        self._displayed: tuple[dict, list[dict], float | None] | None = None
         self._net_test_token = 0
         self._active_weather_token: int | None = None
         self._active_net_test_token: int | None = None
+        # Suggestions come from the local index as the city is typed; the geocoder is only
+        # asked after a pause, and a newer keystroke cancels that request.
+        self.city_index = CityIndex()
+        self._suggest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="city-suggest")
+        self._suggest_cancel = None
+        self._suggest_timer = QtCore.QTimer(self)
+        self._suggest_timer.setSingleShot(True)
+        self._suggest_timer.setInterval(REMOTE_DELAY_MS)
+        self._suggest_timer.timeout.connect(self._fetch_remote_suggestions)
 
         self.weather_ready.connect(self._on_weather_ready)
         self.weather_error.connect(self._on_weather_error)
         self.network_test_done.connect(self._on_network_test_done)
+        self.prefetch_ready.connect(self._on_prefetched)
+        self.client_ready.connect(self._on_client_ready)
+        self.suggestions_ready.connect(self._on_remote_suggestions)
 
         self._build_ui()
         self._apply_settings()
+        self._watch_settings()
+        self.profile.mark("ui build")
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            QtCore.QTimer.singleShot(0, self._on_first_paint)
+
+    def _on_first_paint(self):
+        self.profile.mark("first paint")
+        # The client (and the weather module behind it) is only set up once the window
+        # is on screen, and off the GUI thread.
+        self._executor.submit(lambda: self.client_ready.emit(self._create_client()))
+
+    def _on_client_ready(self, client):
+        self.profile.mark("client setup")
+        if self.client is not None:
+            # A refresh or network test before this finished already built one.
+            return
+        self._ensure_client(client)
+        self.refresh_weather()
+
+    @staticmethod
+    def _create_client():
+        return _load_weather_module().WeatherClient(stale_while_revalidate=True)
+
+    def _ensure_client(self, client=None):
+        if self.client is not None:
+            return
+        self.client = client if client is not None else self._create_client()
+        self.prefetcher = FavoritesPrefetcher(
+            self.client,
+            interval=float(self.settings.get("prefetch_interval", 600)),
+            on_update=self._on_prefetch_update,
+        )
+        self.prefetcher.start(self.settings.get("favorites", []), CANONICAL_UNITS)
+        self._suggest_executor.submit(self._load_city_index, self.client)
+
+    def _load_city_index(self, client):
+        # Off the GUI thread: builds the gazetteer's prefix table.
+        if client.gazetteer is not None:
+            client.gazetteer.warm()
+        self.city_index.load(favorites=self.settings.get("favorites", []), gazetteer=client.gazetteer)
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        self.profile.report()
+        self._supersede_request()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._cancel_remote_suggestions()
+        self._suggest_executor.shutdown(wait=False, cancel_futures=True)
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        self.snapshots.close()
+        self.history.close()
+        self.settings.close()
+        super().closeEvent(event)
 
     def _build_ui(self):
         root = QtWidgets.QWidget()
@@ -185,6 +284,14 @@ class WeatherWindow(QtWidgets.QMainWindow):
         self.city_entry = QtWidgets.QLineEdit()
         self.city_entry.setPlaceholderText("Enter city")
         self.city_entry.returnPressed.connect(self.refresh_weather)
+        # textEdited, unlike textChanged, only fires for typing.
+        self.city_entry.textEdited.connect(self._on_city_edited)
+        self.suggestion_model = QtCore.QStringListModel(self)
+        self.completer = QtWidgets.QCompleter(self.suggestion_model, self)
+        # The model already holds the ranked matches; the completer must not refilter them.
+        self.completer.setCompletionMode(QtWidgets.QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.activated.connect(self._on_suggestion_activated)
+        self.city_entry.setCompleter(self.completer)
         controls.addWidget(self.city_entry, 1)
 
         self.refresh_btn = QtWidgets.QPushButton("Refresh")
@@ -234,6 +341,10 @@ class WeatherWindow(QtWidgets.QMainWindow):
         self.current_text = QtWidgets.QTextEdit()
         self.current_text.setReadOnly(True)
         current_layout.addWidget(self.current_text)
+        self.as_of_label = QtWidgets.QLabel()
+        self.as_of_label.setStyleSheet("color: palette(mid);")
+        self.as_of_label.hide()
+        current_layout.addWidget(self.as_of_label)
         left.addWidget(self.current_box)
 
         self.forecast_box = QtWidgets.QGroupBox("5-Day Forecast")
@@ -272,7 +383,43 @@ class WeatherWindow(QtWidgets.QMainWindow):
         self._apply_http_backend(backend)
 
         self._refresh_favorites_ui()
-        self.refresh_weather()
+        snapshot = self.snapshots.get(city, CANONICAL_UNITS)
+        if snapshot is not None:
+            fetched_at, bundle = snapshot
+            self._render_weather(bundle["current"], bundle["forecast"], as_of=fetched_at)
+
+    def _watch_settings(self):
+        # Another running instance (or the CLI) may rewrite settings.json; follow it.
+        # Saves replace the file by rename, which drops a watch on the file on some
+        # platforms, so the directory is watched as well and the file re-added.
+        self.settings.subscribe(self._on_setting_changed, "units", "theme", "favorites", "http_backend")
+        path = str(self.settings.path)
+        self._settings_watcher = QtCore.QFileSystemWatcher(self)
+        self._settings_watcher.addPath(os.path.dirname(path))
+        if os.path.exists(path):
+            self._settings_watcher.addPath(path)
+
+        def changed(_path: str):
+            if os.path.exists(path) and path not in self._settings_watcher.files():
+                self._settings_watcher.addPath(path)
+            self.settings.reload()
+
+        self._settings_watcher.fileChanged.connect(changed)
+        self._settings_watcher.directoryChanged.connect(changed)
+
+    def _on_setting_changed(self, key: str, value):
+        # Also runs for our own changes; every branch is a no-op when the UI already agrees.
+        if key == "units":
+            self.units_box.setCurrentIndex(0 if value == "imperial" else 1)
+        elif key == "theme":
+            self.theme_box.setCurrentIndex(0 if value == "light" else 1)
+        elif key == "http_backend":
+            self.ps_checkbox.setChecked(value == "powershell")
+        elif key == "favorites":
+            self._refresh_favorites_ui()
+            self.city_index.set_favorites(value)
+            if self.prefetcher is not None:
+                self.prefetcher.set_cities(value)
 
     def _set_status(self, text: str):
         self.status_label.setText(text)
@@ -280,7 +427,6 @@ class WeatherWindow(QtWidgets.QMainWindow):
     def _set_loading(self, is_loading: bool):
         for btn in (self.refresh_btn, self.save_btn, self.remove_btn):
             btn.setEnabled(not is_loading)
-        self.units_box.setEnabled(not is_loading)
         self.theme_box.setEnabled(not is_loading)
         self.net_test_btn.setEnabled(True)
 
@@ -289,34 +435,116 @@ class WeatherWindow(QtWidgets.QMainWindow):
         for city in self.settings.get("favorites", []):
             self.favorites_list.addItem(city)
 
+    def _on_city_edited(self, text: str):
+        self._cancel_remote_suggestions()
+        local = self.city_index.suggest(text)
+        self._show_suggestions(local)
+        specific = len(" ".join(text.split())) >= REMOTE_MIN_CHARS
+        if specific and len(local) < self.city_index.limit and self.client is not None:
+            self._suggest_timer.start()
+
+    def _cancel_remote_suggestions(self):
+        self._suggest_timer.stop()
+        if self._suggest_cancel is not None:
+            self._suggest_cancel.cancel()
+            self._suggest_cancel = None
+
+    def _fetch_remote_suggestions(self):
+        text = self.city_entry.text()
+        weather_api = _load_weather_module()
+        cancel = weather_api.CancelToken()
+        client = self.client
+        limit = self.city_index.limit
+
+        def task():
+            with cancel.bound():
+                try:
+                    locations = client.search_cities(text, limit)
+                except weather_api.WeatherAPIError:
+                    return
+            self.suggestions_ready.emit(cancel, text, [location_label(loc) for loc in locations])
+
+        self._suggest_cancel = cancel
+        self._suggest_executor.submit(task)
+
+    def _on_remote_suggestions(self, cancel, text: str, remote: list[str]):
+        if cancel is not self._suggest_cancel or cancel.cancelled:
+            return
+        self._suggest_cancel = None
+        self._show_suggestions(merge_suggestions(self.city_index.suggest(text), remote, self.city_index.limit))
+
+    def _show_suggestions(self, suggestions: list[str]):
+        self.suggestion_model.setStringList(suggestions)
+        if suggestions:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def _on_suggestion_activated(self, text: str):
+        self._cancel_remote_suggestions()
+        self.city_entry.setText(text)
+        self.refresh_weather()
+
     def _on_favorite_selected(self, item: QtWidgets.QListWidgetItem):
         city = item.text().strip()
-        if city:
-            self.city_entry.setText(city)
+        if not city:
+            return
+        self.city_entry.setText(city)
+        if self.prefetcher is None:
             self.refresh_weather()
+            return
+
+        self.prefetcher.prioritize(city)
+        cached = self.prefetcher.get(city, CANONICAL_UNITS)
+        if cached is None:
+            self.refresh_weather()
+            return
+
+        # Drop any in-flight refresh and paint the prefetched bundle right away.
+        self._supersede_request()
+        self._active_weather_token = None
+        _, bundle = cached
+        self._render_weather(bundle["current"], bundle["forecast"], as_of=self._stale_as_of(bundle))
+        self._set_loading(False)
+        self._set_status(f"Showing saved weather for {bundle['current']['city']}")
+
+    def _on_prefetch_update(self, city: str, units: str, bundle: dict):
+        # Runs on a prefetch worker, so the snapshot and history writes stay off the GUI thread.
+        self.snapshots.put(city, units, bundle)
+        self.history.append(city, bundle["current"], units, bundle.get("fetched_at"))
+        self.prefetch_ready.emit(city, units, bundle)
+
+    def _on_prefetched(self, city: str, _units: str, bundle: dict):
+        if self._active_weather_token is not None:
+            return
+        if city.casefold() != self.city_entry.text().strip().casefold():
+            return
+        self._render_weather(bundle["current"], bundle["forecast"], as_of=self._stale_as_of(bundle))
 
     def _on_units_changed(self):
-        self.settings["units"] = self.units_box.currentText()
-        save_settings(self.settings)
+        self.settings.set("units", self.units_box.currentText())
+        if self._displayed is not None:
+            self._render_weather(*self._displayed)
 
     def _on_theme_changed(self):
         theme = self.theme_box.currentText()
         self._apply_theme(theme)
-        self.settings["theme"] = theme
-        save_settings(self.settings)
+        self.settings.set("theme", theme)
 
     def _on_http_backend_changed(self):
         backend = "powershell" if self.ps_checkbox.isChecked() else "auto"
         self._apply_http_backend(backend)
-        self.settings["http_backend"] = backend
-        save_settings(self.settings)
+        self.settings.set("http_backend", backend)
 
     def _apply_http_backend(self, backend: str):
         if backend == "powershell":
             os.environ["WEATHER_HTTP_BACKEND"] = "powershell"
         else:
             os.environ.pop("WEATHER_HTTP_BACKEND", None)
-        self.client = WeatherClient()
+        if self.client is None:
+            return
+        self.client = self._create_client()
+        self.prefetcher.client = self.client
 
     def _apply_theme(self, theme: str):
         app = QtWidgets.QApplication.instance()
@@ -339,13 +567,11 @@ class WeatherWindow(QtWidgets.QMainWindow):
         city = self.city_entry.text().strip()
         if not city:
             return
-        favorites = self.settings.setdefault("favorites", [])
+        favorites = self.settings.get("favorites", [])
         if city not in favorites:
             favorites.append(city)
-        self.settings["city"] = city
-        self.settings["units"] = self.units_box.currentText()
-        save_settings(self.settings)
-        self._refresh_favorites_ui()
+        # The favorites subscriber refreshes the list and the prefetcher.
+        self.settings.update({"favorites": favorites, "city": city, "units": self.units_box.currentText()})
         self._set_status(f"Saved city: {city}")
 
     def remove_selected_city(self):
@@ -354,50 +580,84 @@ class WeatherWindow(QtWidgets.QMainWindow):
             self._set_status("Select a city in Saved Cities first")
             return
         city = item.text()
-        favorites = self.settings.setdefault("favorites", [])
+        favorites = self.settings.get("favorites", [])
         if city in favorites:
             favorites.remove(city)
-        save_settings(self.settings)
-        self._refresh_favorites_ui()
+            self.settings.set("favorites", favorites)
         self._set_status(f"Removed city: {city}")
 
     def refresh_weather(self):
         city = self.city_entry.text().strip()
+        self._cancel_remote_suggestions()
         if not city:
             self._set_status("Enter a city first")
             return
-        units = self.units_box.currentText()
         backend = "powershell" if self.ps_checkbox.isChecked() else "auto"
 
         self._set_loading(True)
         backend_label = "PowerShell" if backend == "powershell" else "Python"
         self._set_status(f"Fetching weather for {city} via {backend_label}...")
 
-        self._request_token += 1
-        token = self._request_token
+        token = self._supersede_request()
         self._active_weather_token = token
         timeout_token = token
         timeout_ms = 25000 if backend == "powershell" else 12000
         QtCore.QTimer.singleShot(timeout_ms, lambda: self._on_weather_timeout(timeout_token))
 
-        def task():
-            try:
-                current = self.client.current_weather(city, units)
-                forecast = self.client.five_day_forecast(city, units)
-                self.weather_ready.emit(token, current, forecast, units)
-            except WeatherAPIError as exc:
-                self.weather_error.emit(token, str(exc))
-            except Exception as exc:  # noqa: BLE001
-                self.weather_error.emit(token, str(exc))
+        self._ensure_client()
+        weather_api = _load_weather_module()
+        cancel = weather_api.CancelToken()
+        client = self.client
+        prefetcher = self.prefetcher
 
-        threading.Thread(target=task, daemon=True).start()
+        def task():
+            with cancel.bound():
+                try:
+                    bundle = client.fetch_bundle(city, CANONICAL_UNITS)
+                except weather_api.RequestCancelled as exc:
+                    self.weather_error.emit(token, str(exc), None)
+                    return
+                except Exception as exc:  # noqa: BLE001
+                    self.weather_error.emit(token, str(exc), self.snapshots.get(city, CANONICAL_UNITS))
+                    return
+            prefetcher.put(city, CANONICAL_UNITS, bundle)
+            # Both are stamped with the bundle's fetch time, not now: a stale cache entry
+            # served while offline must not pass for a fresh observation.
+            self.snapshots.put(city, CANONICAL_UNITS, bundle)
+            self.history.append(city, bundle["current"], CANONICAL_UNITS, bundle.get("fetched_at"))
+            self.weather_ready.emit(token, bundle["current"], bundle["forecast"], self._stale_as_of(bundle))
+
+        self._active_cancel = cancel
+        self._active_future = self._executor.submit(task)
+
+    def _supersede_request(self) -> int:
+        # Abort the refresh in flight: its response is closed (or its PowerShell child
+        # killed) and its remaining steps are skipped, so quick clicks through favorites
+        # do not pile up blocking fetches.
+        future = self._active_future
+        if future is not None and not future.done():
+            # A refresh that never started is counted here; one that did reports back
+            # with its now-stale token and is counted by the handler instead.
+            if future.cancel():
+                self.refresh_stats["abandoned"] += 1
+            if self._active_cancel is not None:
+                self._active_cancel.cancel()
+        self._active_future = None
+        self._active_cancel = None
+        self._request_token += 1
+        return self._request_token
 
     def _on_weather_timeout(self, token: int):
         if token != self._active_weather_token:
             return
+        self._supersede_request()
         self._active_weather_token = None
         self._set_loading(False)
         message = "Weather request timed out. Network or firewall may be blocking Python."
+        snapshot = self.snapshots.get(self.city_entry.text().strip(), CANONICAL_UNITS)
+        if snapshot is not None:
+            self._show_snapshot(snapshot, message)
+            return
         self._set_status(message)
         self.current_text.setText(f"Weather error:\n{message}")
         self.forecast_list.clear()
@@ -414,10 +674,12 @@ class WeatherWindow(QtWidgets.QMainWindow):
         self._active_net_test_token = token
         timeout_ms = 25000 if backend == "powershell" else 12000
         QtCore.QTimer.singleShot(timeout_ms, lambda: self._on_network_test_timeout(token))
+        self._ensure_client()
+        client = self.client
 
         def task():
             try:
-                current = self.client.current_weather("Lagos", self.units_box.currentText())
+                current = client.current_weather("Lagos", self.units_box.currentText())
                 self.network_test_done.emit(
                     True,
                     f"Open-Meteo reachable. Sample: {current.get('city', 'Lagos')}",
@@ -449,10 +711,40 @@ class WeatherWindow(QtWidgets.QMainWindow):
         self._set_status("Network test failed")
         QtWidgets.QMessageBox.warning(self, "Network Test Timeout", message)
 
-    def _on_weather_ready(self, token: int, current: dict, forecast: list[dict], units: str):
+    def _stale_as_of(self, bundle: dict) -> float | None:
+        return stale_as_of(bundle, _load_weather_module().CURRENT_TTL_SECONDS)
+
+    def _on_weather_ready(self, token: int, current: dict, forecast: list[dict], as_of: float | None = None):
         if token != self._active_weather_token:
+            self.refresh_stats["abandoned"] += 1
             return
+        self.refresh_stats["completed"] += 1
         self._active_weather_token = None
+        self.profile.mark("first data")
+        self.profile.report()
+
+        self._render_weather(current, forecast, as_of=as_of)
+
+        entered = self.city_entry.text().strip()
+        if parse_coordinates(entered) is not None:
+            # Keep the exact point; the label only names the nearest place.
+            self.settings.set("city", entered)
+        else:
+            self.settings.set("city", current.get("city", entered))
+            if current.get("city"):
+                self.city_index.add_recent(current["city"])
+
+        self._set_loading(False)
+        if as_of is not None:
+            self._set_status(f"Showing weather for {current['city']} {format_as_of(as_of)}")
+        else:
+            self._set_status(f"Updated weather for {current['city']}")
+
+    def _render_weather(self, current: dict, forecast: list[dict], as_of: float | None = None):
+        self._displayed = (current, forecast, as_of)
+        units = self.units_box.currentText()
+        current = convert_current(current, units)
+        forecast = convert_forecast(forecast, units)
 
         temp_unit = "F" if units == "imperial" else "C"
         wind_unit = "mph" if units == "imperial" else "km/h"
@@ -471,6 +763,8 @@ class WeatherWindow(QtWidgets.QMainWindow):
         )
 
         self.current_text.setText(summary)
+        self.as_of_label.setText(format_as_of(as_of) if as_of is not None else "")
+        self.as_of_label.setVisible(as_of is not None)
         self.forecast_list.clear()
         for day in forecast:
             line = (
@@ -479,30 +773,37 @@ class WeatherWindow(QtWidgets.QMainWindow):
             )
             self.forecast_list.addItem(line)
 
-        self.settings["city"] = current.get("city", city := self.city_entry.text().strip())
-        self.settings["units"] = units
-        save_settings(self.settings)
-
-        self._set_loading(False)
-        self._set_status(f"Updated weather for {current['city']}")
-
-    def _on_weather_error(self, token: int, message: str):
+    def _on_weather_error(self, token: int, message: str, snapshot: tuple[float, dict] | None):
         if token != self._active_weather_token:
+            self.refresh_stats["abandoned"] += 1
             return
+        self.refresh_stats["completed"] += 1
         self._active_weather_token = None
+        self.profile.mark("first data")
+        self.profile.report()
         self._set_loading(False)
+        if snapshot is not None:
+            self._show_snapshot(snapshot, message)
+            return
         self._set_status(f"Weather error: {message}")
         self.current_text.setText(f"Weather error:\n{message}")
         self.forecast_list.clear()
         QtWidgets.QMessageBox.warning(self, "Weather Error", message)
 
+    def _show_snapshot(self, snapshot: tuple[float, dict], message: str):
+        fetched_at, bundle = snapshot
+        self._render_weather(bundle["current"], bundle["forecast"], as_of=fetched_at)
+        self._set_status(f"Offline, showing weather {format_as_of(fetched_at)} ({message})")
+
 
 class WeatherQtApp:
     @staticmethod
-    def run_app():
+    def run_app(profile: StartupProfile | None = None):
         app = QtWidgets.QApplication([])
         app.setStyle("Fusion")
         app.setStyleSheet(_LIGHT_QSS)
-        window = WeatherWindow()
+        if profile is not None:
+            profile.mark("css install")
+        window = WeatherWindow(profile)
         window.show()
         app.exec()
@@ -1,24 +1,245 @@
+import bisect
+import contextlib
+import contextvars
+import math
 import os
 import json
 import subprocess
-from typing import Dict, List
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+from autocomplete import location_label
+from gazetteer import Gazetteer, default_gazetteer, resolve_coordinates
+from units import (
+    CANONICAL_UNITS,
+    convert_bundle,
+    convert_current,
+    convert_forecast,
+    convert_temperature_column,
+    convert_wind_column,
+)
+
 try:
     import requests  # type: ignore
+    from urllib3.exceptions import HTTPError as _Urllib3Error  # type: ignore
 except Exception:  # noqa: BLE001
     requests = None
 OPEN_METEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 OPEN_METEO_GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+SUGGESTED_LOCATIONS = 256
+
+HOURLY_FORECAST_DAYS = 16
+
+CURRENT_TTL_SECONDS = 10 * 60
+DAILY_TTL_SECONDS = 60 * 60
+
+# Open-Meteo forecasts can be cached per cell of this many degrees, so nearby places share
+# one request: the first place asked for in a cell is fetched at its exact coordinates and
+# the others in that cell are served its forecast until it expires. Off (0, exact
+# coordinates only) unless WEATHER_FORECAST_GRID opts in.
+FORECAST_GRID_DEGREES = 0.0
+
+# Bodies are read and inflated in pieces of this size; anything that inflates past
+# MAX_DECODED_BYTES is rejected rather than buffered.
+READ_CHUNK_BYTES = 64 * 1024
+MAX_DECODED_BYTES = 32 * 1024 * 1024
 
 
 class WeatherAPIError(Exception):
     pass
 
 
+class RequestCancelled(WeatherAPIError):
+    pass
+
+
+_current_cancel_token: contextvars.ContextVar["CancelToken | None"] = contextvars.ContextVar(
+    "weather_cancel_token", default=None
+)
+
+
+class CancelToken:
+    # Bound to a worker with `with token.bound():`. Every HTTP call made inside checks it
+    # before starting and registers a way to abort itself (closing the response or killing
+    # the PowerShell child), so cancel() stops the request in flight and skips the rest.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._next_handle = 0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:  # noqa: BLE001
+                pass
+
+    def check(self) -> None:
+        if self._cancelled:
+            raise RequestCancelled("Request was superseded.")
+
+    def on_cancel(self, callback: Callable[[], None]) -> int:
+        with self._lock:
+            if not self._cancelled:
+                self._next_handle += 1
+                self._callbacks[self._next_handle] = callback
+                return self._next_handle
+        # Already cancelled: run it now, as cancel() would have, and with the same guard.
+        try:
+            callback()
+        except OSError:
+            pass
+        raise RequestCancelled("Request was superseded.")
+
+    def remove(self, handle: int) -> None:
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    @contextlib.contextmanager
+    def bound(self):
+        reset = _current_cancel_token.set(self)
+        try:
+            yield self
+        finally:
+            _current_cancel_token.reset(reset)
+
+
+@contextlib.contextmanager
+def _abort_on_cancel(token: "CancelToken | None", abort: Callable[[], None]):
+    if token is None:
+        yield
+        return
+    handle = token.on_cancel(abort)
+    try:
+        yield
+    finally:
+        token.remove(handle)
+
+
+def _select_json_decoder(name: str | None = None) -> tuple[str, Callable[[bytes], object]]:
+    # Every candidate takes the raw response bytes as-is; orjson and ujson parse them
+    # without building an intermediate str. WEATHER_JSON_BACKEND pins one (or "json").
+    preferred = (name or os.getenv("WEATHER_JSON_BACKEND") or "auto").strip().lower()
+    candidates = ("orjson", "ujson") if preferred == "auto" else (preferred,)
+    for candidate in candidates:
+        if candidate == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+            return "orjson", orjson.loads
+        if candidate == "ujson":
+            try:
+                import ujson
+            except ImportError:
+                continue
+            return "ujson", ujson.loads
+    return "json", json.loads
+
+
+JSON_BACKEND, _json_loads = _select_json_decoder()
+
+
+class _BodyDecoder:
+    # Inflates a gzip/deflate body chunk by chunk as it is read, and counts bytes on the
+    # wire versus bytes handed to the JSON parser.
+    def __init__(self, content_encoding: str | None):
+        self.encoding = (content_encoding or "identity").strip().lower()
+        if self.encoding in ("gzip", "x-gzip"):
+            self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._inflater = zlib.decompressobj()
+        elif self.encoding == "identity":
+            self._inflater = None
+        else:
+            raise WeatherAPIError(f"Unsupported Content-Encoding: {self.encoding}")
+        self._parts: list[bytes] = []
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def feed(self, chunk: bytes) -> None:
+        first = self.wire_bytes == 0
+        self.wire_bytes += len(chunk)
+        if self._inflater is None:
+            self._append(chunk)
+            return
+        try:
+            self._append(self._inflater.decompress(chunk))
+        except zlib.error as exc:
+            if not (first and self.encoding == "deflate"):
+                raise WeatherAPIError(f"Corrupt {self.encoding} body: {exc}") from exc
+            # Some servers send raw deflate without the zlib header that RFC 9110 asks for.
+            self._inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+            self._append(self._inflater.decompress(chunk))
+
+    def _append(self, data: bytes) -> None:
+        if not data:
+            return
+        self.decoded_bytes += len(data)
+        if self.decoded_bytes > MAX_DECODED_BYTES:
+            raise WeatherAPIError("Response body is too large.")
+        self._parts.append(data)
+
+    def read_from(self, read: Callable[[int], bytes]) -> bytes:
+        while True:
+            chunk = read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            self.feed(chunk)
+        return self.finish()
+
+    def finish(self) -> bytes:
+        if self._inflater is not None:
+            try:
+                self._append(self._inflater.flush())
+            except zlib.error as exc:
+                raise WeatherAPIError(f"Corrupt {self.encoding} body: {exc}") from exc
+        _record_transfer(self)
+        return b"".join(self._parts)
+
+
+_transfer_lock = threading.Lock()
+_transfer_counts = {"responses": 0, "compressed_responses": 0, "wire_bytes": 0, "decoded_bytes": 0}
+
+
+def _record_transfer(decoder: _BodyDecoder) -> None:
+    with _transfer_lock:
+        _transfer_counts["responses"] += 1
+        if decoder.encoding != "identity":
+            _transfer_counts["compressed_responses"] += 1
+        _transfer_counts["wire_bytes"] += decoder.wire_bytes
+        _transfer_counts["decoded_bytes"] += decoder.decoded_bytes
+
+
+def transfer_stats() -> dict:
+    # The PowerShell fallback decodes inside Invoke-WebRequest and is not counted.
+    with _transfer_lock:
+        return dict(_transfer_counts)
+
+
 def _http_json_request(url: str, params: dict, timeout: int = 10) -> tuple[int, dict]:
+    token = _current_cancel_token.get()
+    if token is not None:
+        token.check()
     query = urlencode(params)
     full_url = f"{url}?{query}" if query else url
     backend = os.getenv("WEATHER_HTTP_BACKEND", "auto").strip().lower()
@@ -28,12 +249,24 @@ def _http_json_request(url: str, params: dict, timeout: int = 10) -> tuple[int,
         try:
             resp = requests.get(
                 full_url,
-                headers={"User-Agent": "WeatherDashboard/1.0", "Accept": "application/json"},
+                headers={
+                    "User-Agent": "WeatherDashboard/1.0",
+                    "Accept": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                },
                 timeout=timeout,
+                stream=True,
             )
-            status = resp.status_code
-            raw = resp.content or b""
-        except requests.RequestException as exc:
+            with _abort_on_cancel(token, resp.close):
+                status = resp.status_code
+                # Read the undecoded stream so the byte counters see what crossed the wire.
+                body = _BodyDecoder(resp.headers.get("Content-Encoding"))
+                raw = body.read_from(lambda size: resp.raw.read(size, decode_content=False))
+        except (requests.RequestException, _Urllib3Error, OSError, AttributeError) as exc:
+            # Reading resp.raw directly surfaces urllib3's own errors (e.g. a read timeout
+            # mid-body), which requests only wraps when it reads the body itself.
+            if token is not None and token.cancelled:
+                raise RequestCancelled("Request was superseded.") from exc
             raise WeatherAPIError(f"Network/API error: {exc}") from exc
     else:
         request = Request(
@@ -41,33 +274,39 @@ def _http_json_request(url: str, params: dict, timeout: int = 10) -> tuple[int,
             headers={
                 "User-Agent": "WeatherDashboard/1.0",
                 "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
             },
         )
 
         status = 0
         raw = b""
         try:
-            with urlopen(request, timeout=timeout) as response:
+            with urlopen(request, timeout=timeout) as response, _abort_on_cancel(token, response.close):
                 status = response.getcode() or 200
-                raw = response.read()
+                raw = _BodyDecoder(response.headers.get("Content-Encoding")).read_from(response.read)
         except HTTPError as exc:
             status = exc.code
-            raw = exc.read()
+            raw = _BodyDecoder(exc.headers.get("Content-Encoding")).read_from(exc.read)
         except URLError as exc:
             # Windows firewall/AV sometimes blocks Python sockets; fall back to PowerShell.
             if os.name == "nt" and "WinError 10013" in str(exc.reason):
                 status, raw = _http_json_request_powershell(full_url, timeout)
             else:
                 raise WeatherAPIError(f"Network/API error: {exc.reason}") from exc
-        except OSError as exc:
+        except (OSError, ValueError) as exc:
+            if token is not None and token.cancelled:
+                raise RequestCancelled("Request was superseded.") from exc
             raise WeatherAPIError(f"Network/API error: {exc}") from exc
 
+    if token is not None:
+        token.check()
     if not raw:
         return status, {}
 
     try:
-        payload = json.loads(raw.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        payload = _json_loads(raw)
+    except ValueError as exc:
+        # All three backends report bad input (including bad UTF-8) as a ValueError.
         raise WeatherAPIError("API returned invalid JSON response.") from exc
 
     return status, payload
@@ -82,22 +321,193 @@ def _http_json_request_powershell(full_url: str, timeout: int) -> tuple[int, byt
         "} catch { "
         "Write-Output $_.Exception.Message; exit 1 }"
     )
+    token = _current_cancel_token.get()
     try:
-        completed = subprocess.run(
+        proc = subprocess.Popen(
             ["powershell.exe", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", ps],
             text=True,
-            capture_output=True,
-            timeout=timeout + 5,
-            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
     except Exception as psex:  # noqa: BLE001
         raise WeatherAPIError(f"Network/API error: {psex}") from psex
 
-    if completed.returncode != 0:
-        msg = (completed.stdout or "").strip() or (completed.stderr or "").strip()
+    try:
+        with _abort_on_cancel(token, proc.kill):
+            stdout, stderr = proc.communicate(timeout=timeout + 5)
+    except subprocess.TimeoutExpired as exc:
+        proc.kill()
+        proc.communicate()
+        raise WeatherAPIError(f"Network/API error: {exc}") from exc
+    except RequestCancelled:
+        proc.communicate()
+        raise
+
+    if token is not None:
+        token.check()
+    if proc.returncode != 0:
+        msg = (stdout or "").strip() or (stderr or "").strip()
         raise WeatherAPIError(f"Network/API error: {msg}")
 
-    return 200, (completed.stdout or "").encode("utf-8")
+    return 200, (stdout or "").encode("utf-8")
+
+
+class ResponseCache:
+    # Keys look like (provider, endpoint, rounded lat/lon or city). Each lookup says
+    # whether it needs "current" or "daily" freshness, so one cached Open-Meteo payload can
+    # serve a five-day forecast long after its current conditions have gone stale.
+    def __init__(
+        self,
+        current_ttl: float = CURRENT_TTL_SECONDS,
+        daily_ttl: float = DAILY_TTL_SECONDS,
+        stale_while_revalidate: bool = False,
+        max_stale: float = 24 * 3600,
+        max_entries: int = 512,
+    ):
+        self.ttls = {"current": current_ttl, "daily": daily_ttl}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (monotonic store time for TTLs, wall-clock fetch time for display, payload,
+        # the point it was fetched for or None)
+        self._entries: OrderedDict[tuple, tuple[float, float, dict, tuple | None]] = OrderedDict()
+        self._refreshing: set[tuple] = set()
+        # Outcomes per "provider/endpoint", the first two elements of the key.
+        self._counts: dict[str, dict[str, int]] = {}
+
+    def _count(self, key: tuple, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                f"{key[0]}/{key[1]}", {"hits": 0, "grid_hits": 0, "stale_hits": 0, "misses": 0}
+            )
+            counts[outcome] += 1
+
+    def _count_hit(self, key: tuple, entry: tuple, point: tuple | None) -> None:
+        # A grid hit serves a forecast fetched for another point in the same cell.
+        shared = point is not None and entry[3] is not None and entry[3] != point
+        self._count(key, "grid_hits" if shared else "hits")
+
+    def fetch(self, key: tuple, kind: str, loader: Callable[[], dict]) -> dict:
+        return self.fetch_entry(key, kind, loader)[1]
+
+    def fetch_entry(
+        self, key: tuple, kind: str, loader: Callable[[], dict], point: tuple | None = None
+    ) -> tuple[float, dict]:
+        # (time.time() of the fetch, payload): a stale-while-revalidate hit can be up to
+        # max_stale old, and callers that show or record it need to know.
+        ttl = self.ttls.get(kind, self.ttls["current"])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            stored_at, fetched_at, payload, _ = entry
+            age = time.monotonic() - stored_at
+            if age <= ttl:
+                self._count_hit(key, entry, point)
+                return fetched_at, payload
+            if self.stale_while_revalidate and age <= ttl + self.max_stale:
+                self._count(key, "stale_hits")
+                self._revalidate(key, loader, point)
+                return fetched_at, payload
+
+        self._count(key, "misses")
+        payload = loader()
+        fetched_at = time.time()
+        self.store(key, payload, fetched_at, point)
+        return fetched_at, payload
+
+    def stats(self) -> dict:
+        # e.g. {"open-meteo/forecast": {"hits": 40, "grid_hits": 5, "stale_hits": 2, "misses": 10,
+        # "hit_rate": 0.82}}; "hits" are repeat requests for the same point within the TTL,
+        # "grid_hits" other points in the same forecast grid cell. Both kinds, and stale
+        # hits, are served, so they count towards the rate.
+        with self._lock:
+            counts = {endpoint: dict(values) for endpoint, values in self._counts.items()}
+        for values in counts.values():
+            served = values["hits"] + values["grid_hits"] + values["stale_hits"]
+            total = served + values["misses"]
+            values["hit_rate"] = served / total if total else 0.0
+        return counts
+
+    def store(
+        self, key: tuple, payload: dict, fetched_at: float | None = None, point: tuple | None = None
+    ) -> None:
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._entries[key] = (time.monotonic(), fetched_at, payload, point)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _revalidate(self, key: tuple, loader: Callable[[], dict], point: tuple | None = None) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def task():
+            try:
+                self.store(key, loader(), point=point)
+            except WeatherAPIError:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SingleFlight:
+    # Concurrent callers asking for the same key share one in-flight call and
+    # receive the same result or exception.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[tuple, Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: tuple, fn: Callable[[], object]):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            try:
+                return future.result()
+            except RequestCancelled:
+                # The caller we piggybacked on was superseded; that is not our failure.
+                token = _current_cancel_token.get()
+                if token is not None and token.cancelled:
+                    raise
+                return self.do(key, fn)
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
 
 
 def _weather_code_to_text(code: int | None) -> str:
@@ -134,8 +544,119 @@ def _weather_code_to_text(code: int | None) -> str:
     return mapping.get(code, "Unknown")
 
 
+def _float_column(values: list, size: int) -> array:
+    column = array("d", (math.nan if value is None else value for value in values[:size]))
+    if len(column) < size:
+        column.extend([math.nan] * (size - len(column)))
+    return column
+
+
+def _code_column(values: list, size: int) -> array:
+    column = array("h", (-1 if value is None else value for value in values[:size]))
+    if len(column) < size:
+        column.extend([-1] * (size - len(column)))
+    return column
+
+
+class HourlyForecast:
+    # Columnar hourly series: every variable is a flat array indexed by the shared
+    # `time` axis (UTC epoch seconds, ascending). Missing values are NaN, or -1 for
+    # weather codes. window() bisects the time axis, so slicing a day out of a 16-day
+    # series is two binary searches and a few contiguous copies.
+    __slots__ = ("time", "temp", "precipitation_probability", "wind", "code", "utc_offset", "_converted")
+
+    def __init__(
+        self,
+        time: array | None = None,
+        temp: array | None = None,
+        precipitation_probability: array | None = None,
+        wind: array | None = None,
+        code: array | None = None,
+        utc_offset: int = 0,
+    ):
+        self.time = time if time is not None else array("q")
+        self.temp = temp if temp is not None else array("d")
+        self.precipitation_probability = (
+            precipitation_probability if precipitation_probability is not None else array("d")
+        )
+        self.wind = wind if wind is not None else array("d")
+        self.code = code if code is not None else array("h")
+        self.utc_offset = utc_offset
+        self._converted: tuple[str, "HourlyForecast"] | None = None
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def window(self, start: float | None = None, end: float | None = None) -> "HourlyForecast":
+        first = 0 if start is None else bisect.bisect_left(self.time, start)
+        last = len(self.time) if end is None else bisect.bisect_left(self.time, end)
+        return HourlyForecast(
+            self.time[first:last],
+            self.temp[first:last],
+            self.precipitation_probability[first:last],
+            self.wind[first:last],
+            self.code[first:last],
+            self.utc_offset,
+        )
+
+    def next_hours(self, hours: int, now: float | None = None) -> "HourlyForecast":
+        # Starts with the slot that covers `now`, which began up to one step earlier.
+        now = time.time() if now is None else now
+        step = self.time[1] - self.time[0] if len(self.time) > 1 else 3600
+        return self.window(now - step + 1, now + hours * 3600)
+
+    def converted(self, units: str) -> "HourlyForecast":
+        # Converting a column is a pass over it in Python, so a cached forecast converts
+        # once and every later caller in the same units gets that copy.
+        if units == CANONICAL_UNITS:
+            return self
+        converted = self._converted
+        if converted is None or converted[0] != units:
+            converted = self._converted = (
+                units,
+                HourlyForecast(
+                    self.time,
+                    convert_temperature_column(self.temp, units),
+                    self.precipitation_probability,
+                    convert_wind_column(self.wind, units),
+                    self.code,
+                    self.utc_offset,
+                ),
+            )
+        return converted[1]
+
+
+def _location_key(city: str) -> str:
+    return " ".join(city.casefold().split())
+
+
 class OpenMeteoClient:
+    def __init__(
+        self,
+        response_cache: ResponseCache | None = None,
+        gazetteer: Gazetteer | None = None,
+        grid: float = FORECAST_GRID_DEGREES,
+    ):
+        self.response_cache = response_cache
+        self.gazetteer = gazetteer
+        self.grid = grid
+        self._suggested: OrderedDict[str, Dict] = OrderedDict()
+        self._suggested_lock = threading.Lock()
+
     def _geocode(self, city: str) -> Dict:
+        # Coordinates need no geocoding at all; the gazetteer only names them.
+        location = resolve_coordinates(city, self.gazetteer)
+        if location is not None:
+            return location
+        with self._suggested_lock:
+            suggested = self._suggested.get(_location_key(city))
+        if suggested is not None:
+            return suggested
+        # The offline gazetteer answers first; the API is only asked about misses.
+        if self.gazetteer is not None:
+            location = self.gazetteer.lookup(city)
+            if location is not None:
+                return location
         status_code, payload = _http_json_request(
             OPEN_METEO_GEOCODE_URL,
             {"name": city, "count": 1, "language": "en", "format": "json"},
@@ -156,16 +677,62 @@ class OpenMeteoClient:
             "longitude": top.get("longitude"),
         }
 
-    def _forecast(self, latitude: float, longitude: float, units: str) -> Dict:
-        temp_unit = "fahrenheit" if units == "imperial" else "celsius"
-        wind_unit = "mph" if units == "imperial" else "kmh"
+    def search_cities(self, text: str, count: int = 8) -> List[Dict]:
+        # Geocoder matches for a partial name, for autocomplete. Each one is remembered
+        # under its "Name, Country" label so picking it resolves to that exact place
+        # without another request.
+        status_code, payload = _http_json_request(
+            OPEN_METEO_GEOCODE_URL,
+            {"name": text, "count": count, "language": "en", "format": "json"},
+            timeout=10,
+        )
+        if status_code >= 400:
+            raise WeatherAPIError(f"Open-Meteo geocoding failed (HTTP {status_code}).")
+        locations = []
+        for result in payload.get("results") or []:
+            if result.get("latitude") is None or result.get("longitude") is None:
+                continue
+            location = {
+                "name": result.get("name", ""),
+                "country": result.get("country", ""),
+                "latitude": result["latitude"],
+                "longitude": result["longitude"],
+            }
+            with self._suggested_lock:
+                self._suggested[_location_key(location_label(location))] = location
+                while len(self._suggested) > SUGGESTED_LOCATIONS:
+                    self._suggested.popitem(last=False)
+            locations.append(location)
+        return locations
+
+    def _grid_point(self, latitude: float, longitude: float) -> tuple[float, float]:
+        # Centre of the grid cell the point falls in, for cache keys only; requests are
+        # always made for the exact point. The point itself with no grid.
+        if self.grid <= 0:
+            return latitude, longitude
+        cell_latitude = (math.floor(latitude / self.grid) + 0.5) * self.grid
+        cell_longitude = (math.floor(longitude / self.grid) + 0.5) * self.grid
+        return round(max(-90.0, min(90.0, cell_latitude)), 6), round(max(-180.0, min(180.0, cell_longitude)), 6)
+
+    def _forecast(self, latitude: float, longitude: float, kind: str = "current") -> Dict:
+        return self._forecast_entry(latitude, longitude, kind)[1]
+
+    def _forecast_entry(self, latitude: float, longitude: float, kind: str = "current") -> tuple[float, Dict]:
+        if self.response_cache is None:
+            payload = self._fetch_forecast(latitude, longitude)
+            return time.time(), payload
+        cell_latitude, cell_longitude = self._grid_point(latitude, longitude)
+        key = ("open-meteo", "forecast", round(cell_latitude, 4), round(cell_longitude, 4))
+        return self.response_cache.fetch_entry(
+            key, kind, lambda: self._fetch_forecast(latitude, longitude), (latitude, longitude)
+        )
 
+    def _fetch_forecast(self, latitude: float, longitude: float) -> Dict:
+        # Open-Meteo defaults to celsius and km/h, i.e. CANONICAL_UNITS.
         params = {
             "latitude": latitude,
             "longitude": longitude,
             "timezone": "auto",
-            "temperature_unit": temp_unit,
-            "wind_speed_unit": wind_unit,
             "current": "temperature_2m,relative_humidity_2m,apparent_temperature,wind_speed_10m,weather_code",
             "daily": "temperature_2m_max,temperature_2m_min,weather_code",
             "forecast_days": 5,
@@ -178,8 +745,59 @@ class OpenMeteoClient:
 
     def current_weather(self, city: str, units: str = "imperial") -> Dict:
         location = self._geocode(city)
-        data = self._forecast(location["latitude"], location["longitude"], units)
+        data = self._forecast(location["latitude"], location["longitude"])
+        return convert_current(self._parse_current(location, data), units)
 
+    def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
+        location = self._geocode(city)
+        data = self._forecast(location["latitude"], location["longitude"], kind="daily")
+        return convert_forecast(self._parse_daily(data), units)
+
+    def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        # The forecast payload already carries both the current and daily blocks.
+        # "fetched_at" can be well before now when a stale cache entry is served.
+        location = self._geocode(city)
+        fetched_at, data = self._forecast_entry(location["latitude"], location["longitude"])
+        return convert_bundle(
+            {
+                "current": self._parse_current(location, data),
+                "forecast": self._parse_daily(data),
+                "fetched_at": fetched_at,
+            },
+            units,
+        )
+
+    def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        # Hourly data is its own request so the bundle fetch stays small; the cache keeps
+        # the parsed columns rather than the JSON lists.
+        location = self._geocode(city)
+        latitude, longitude = location["latitude"], location["longitude"]
+        if self.response_cache is None:
+            return self._fetch_hourly(latitude, longitude).converted(units)
+        cell_latitude, cell_longitude = self._grid_point(latitude, longitude)
+        key = ("open-meteo", "hourly", round(cell_latitude, 4), round(cell_longitude, 4))
+        _, forecast = self.response_cache.fetch_entry(
+            key, "current", lambda: self._fetch_hourly(latitude, longitude), (latitude, longitude)
+        )
+        return forecast.converted(units)
+
+    def _fetch_hourly(self, latitude: float, longitude: float) -> HourlyForecast:
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": "auto",
+            "timeformat": "unixtime",
+            "hourly": "temperature_2m,precipitation_probability,wind_speed_10m,weather_code",
+            "forecast_days": HOURLY_FORECAST_DAYS,
+        }
+
+        status_code, payload = _http_json_request(OPEN_METEO_FORECAST_URL, params, timeout=10)
+        if status_code >= 400:
+            raise WeatherAPIError(f"Open-Meteo forecast failed (HTTP {status_code}).")
+        return self._parse_hourly(payload)
+
+    @staticmethod
+    def _parse_current(location: Dict, data: Dict) -> Dict:
         current = data.get("current", {})
         daily = data.get("daily", {})
         min_list = daily.get("temperature_2m_min", [])
@@ -198,11 +816,11 @@ class OpenMeteoClient:
             "humidity": current.get("relative_humidity_2m"),
             "wind": current.get("wind_speed_10m"),
             "description": _weather_code_to_text(current.get("weather_code")),
+            "code": current.get("weather_code"),
         }
 
-    def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
-        location = self._geocode(city)
-        data = self._forecast(location["latitude"], location["longitude"], units)
+    @staticmethod
+    def _parse_daily(data: Dict) -> List[Dict]:
         daily = data.get("daily", {})
 
         dates = daily.get("time", [])
@@ -231,14 +849,62 @@ class OpenMeteoClient:
 
         return out
 
+    @staticmethod
+    def _parse_hourly(data: Dict) -> HourlyForecast:
+        hourly = data.get("hourly", {})
+        times = array("q", hourly.get("time", []))
+        size = len(times)
+        return HourlyForecast(
+            times,
+            _float_column(hourly.get("temperature_2m", []), size),
+            _float_column(hourly.get("precipitation_probability", []), size),
+            _float_column(hourly.get("wind_speed_10m", []), size),
+            _code_column(hourly.get("weather_code", []), size),
+            data.get("utc_offset_seconds", 0),
+        )
+
 
 class WeatherClient:
-    def __init__(self, provider: str | None = None, api_key: str | None = None):
+    def __init__(
+        self,
+        provider: str | None = None,
+        api_key: str | None = None,
+        stale_while_revalidate: bool = False,
+        forecast_grid: float | None = None,
+    ):
         self.provider = (provider or os.getenv("WEATHER_PROVIDER") or "open-meteo").lower()
-        self.client = OpenMeteoClient()
+        self.response_cache = ResponseCache(stale_while_revalidate=stale_while_revalidate)
+        self.gazetteer = default_gazetteer()
+        if forecast_grid is None:
+            forecast_grid = float(os.getenv("WEATHER_FORECAST_GRID") or FORECAST_GRID_DEGREES)
+        self.forecast_grid = forecast_grid
+        self.client = OpenMeteoClient(self.response_cache, self.gazetteer, forecast_grid)
+        self.single_flight = SingleFlight()
+
+    def _coalesced(self, method_name: str, city: str, *args):
+        # The prefetcher and a refresh often ask for the same city at once; they share
+        # one upstream request.
+        key = (method_name, _location_key(city)) + args
+        return self.single_flight.do(key, lambda: getattr(self.client, method_name)(city, *args))
 
     def current_weather(self, city: str, units: str = "imperial") -> Dict:
-        return self.client.current_weather(city, units)
+        return self._coalesced("current_weather", city, units)
 
     def five_day_forecast(self, city: str, units: str = "imperial") -> List[Dict]:
-        return self.client.five_day_forecast(city, units)
+        return self._coalesced("five_day_forecast", city, units)
+
+    def fetch_bundle(self, city: str, units: str = "imperial") -> Dict:
+        return self._coalesced("fetch_bundle", city, units)
+
+    def hourly_forecast(self, city: str, units: str = "imperial") -> HourlyForecast:
+        return self._coalesced("hourly_forecast", city, units)
+
+    def search_cities(self, text: str, count: int = 8) -> List[Dict]:
+        return self._coalesced("search_cities", text, count)
+
+    def transfer_stats(self) -> dict:
+        return transfer_stats()
+
+    def cache_stats(self) -> dict:
+        # Forecast hit rates per endpoint; compare them across WEATHER_FORECAST_GRID values.
+        return self.response_cache.stats()